@@ -1,17 +1,31 @@
 # Calculates attacker cost as a function of Zipf coefficient for k=1 in k-scheme
 
 import os
+import sys
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 
 from src.parsers import attacker_cost_parser
 import src.data_gen as dg
+import src.io_utils as io
 import src.opt_utils as opt
+import src.cache_utils as cu
+import src.timing_utils as tu
+
+
+def save(writer, s, cost, gap=None):
+    # appends the result of a Zipf coefficient to the CSV file, if data is saved
+    if writer is None:
+        return
+    row = {'s': s, 'cost': cost}
+    if gap is not None:
+        row['gap'] = gap
+    writer.write(row)
 
 
 def main():
     args = attacker_cost_parser().parse_args()
+    if args.timing:
+        tu.stats.enable()
 
     ALPHA = 1.0 / 3 if args.mode == 'stop' else 2.0 / 3
     WEIGHTS = dg.get_voting_power(n_seats=args.n_seats, k=1)
@@ -20,45 +34,131 @@ def main():
             step=args.zipfc_step)
 
     attacker_costs = np.empty_like(zipf_coeffs)
+    gaps = None if args.approx is None else np.empty_like(zipf_coeffs)
+    cache = cu.get_cache(cache_dir=args.cache_dir, cache_size=args.cache_size)
 
+    # rows are appended to the CSV file as they are solved, so an interrupted run can be resumed;
+    # files of other formats are written at the end from a checkpoint CSV file
+    writer = None
+    if args.csv:
+        io.check_format(args.format)
+        fname = '{}_cost.{}'.format(args.mode, args.format)
+        if args.format != 'csv':
+            stream = '{}_cost.checkpoint.csv'.format(args.mode)
+            if os.path.isfile(stream) and not args.resume:
+                sys.exit('Checkpoint {} of an interrupted run exists, pass --resume to continue '
+                        'it or remove it'.format(stream))
+            fname = io.get_fname(fname, if_exists=args.if_exists)
+        elif args.resume and os.path.isfile(fname):
+            stream = fname
+        else:
+            fname = stream = io.get_fname(fname, if_exists=args.if_exists)
+        if fname is not None:
+            writer = io.CsvWriter(fname=stream, fieldnames=['s', 'cost'] + \
+                    ([] if gaps is None else ['gap']), resume=args.resume)
+
+    # Zipf coefficients the file already holds are not solved again
+    done = {} if writer is None else {round(row['s'], 9): row for row in writer.rows}
+    todo = []
     for i, z in enumerate(zipf_coeffs):
-        if args.verbose:
-            print('Solving problem for zipfc={:.2f}'.format(z))
-        costs = dg.get_costs(n_nodes=args.n_nodes, zipf_coeffs=z)[:args.n_seats]
-        
-        model = opt.get_model(n_seats=args.n_seats, alpha=ALPHA, costs=costs, weights=WEIGHTS,
-                mode=args.mode)
+        row = done.get(round(z, 9))
+        if row is None:
+            todo += [i]
+            continue
+        attacker_costs[i] = row['cost']
+        if gaps is not None:
+            gaps[i] = row['gap']
+
+    if not todo:
+        print('All values of zipfc have been solved')
+    elif args.approx is not None:
+        model = opt.get_persistent_model(n_seats=args.n_seats, alpha=ALPHA, weights=WEIGHTS,
+                mode=args.mode, solver_name=args.solver)
+
+        for i in todo:
+            z = zipf_coeffs[i]
+            if args.verbose:
+                print('Solving problem for zipfc={:.2f}'.format(z))
+            costs = dg.get_costs(n_nodes=args.n_nodes, zipf_coeffs=z)[:args.n_seats]
+
+            result, gaps[i] = opt.optimize_approx(n_seats=args.n_seats, alpha=ALPHA, costs=costs,
+                    weights=WEIGHTS, mode=args.mode, solver_name=args.solver,
+                    verbose=args.verbose, tol=args.approx, model=model, cache=cache,
+                    epsilon=args.epsilon)
+            attacker_costs[i] = result[3]
+            save(writer, s=z, cost=attacker_costs[i], gap=gaps[i])
+    elif args.parametric:
+        get_costs = lambda s: dg.get_costs(n_nodes=args.n_nodes, zipf_coeffs=s)[:args.n_seats]
+        solve = lambda costs: opt.optimize(n_seats=args.n_seats, alpha=ALPHA, costs=costs,
+                weights=WEIGHTS, mode=args.mode, solver_name=args.solver, verbose=args.verbose,
+                cache=cache, epsilon=args.epsilon)[4]
+
+        zs = zipf_coeffs[todo]
+        breakpoints, selections = opt.parametric_sweep(get_costs=get_costs, solve=solve,
+                s_min=zs[0], s_max=zs[-1])
+        attacker_costs[todo] = opt.evaluate_sweep(get_costs=get_costs, breakpoints=breakpoints,
+                selections=selections, s=zs)
+        for i in todo:
+            save(writer, s=zipf_coeffs[i], cost=attacker_costs[i])
 
-        _, _, _, attacker_cost, _, _ = opt.solve(model=model, solver_name=args.solver,
-                verbose=args.verbose)
-
-        attacker_costs[i] = attacker_cost
+        if args.verbose:
+            print('Optimal selection changes at zipfc:', breakpoints)
+            for b, sel in zip([zs[0]] + list(breakpoints), selections):
+                print('From zipfc={:.6f}, seats to be selected: {}'.format(b, sel))
+    elif args.solver == 'dp':
+        # all Zipf coefficients share the voting power, so solve them in one batch
+        if args.verbose:
+            print('Solving problems for {} values of zipfc'.format(len(todo)))
+        costs = dg.get_costs_batch(n_nodes=args.n_nodes, zipf_coeffs=zipf_coeffs[todo],
+                n_seats=args.n_seats)
+        attacker_costs[todo], _ = opt.solve_dp_batch(alpha=ALPHA, costs=costs, weights=WEIGHTS,
+                mode=args.mode, cache=cache)
+        for i in todo:
+            save(writer, s=zipf_coeffs[i], cost=attacker_costs[i])
+    else:
+        model = opt.get_persistent_model(n_seats=args.n_seats, alpha=ALPHA, weights=WEIGHTS,
+                mode=args.mode, solver_name=args.solver)
+
+        # neighbouring coefficients mostly share the optimum, so warm start from the previous one
+        selected_seats = None
+
+        for i in todo:
+            z = zipf_coeffs[i]
+            if args.verbose:
+                print('Solving problem for zipfc={:.2f}'.format(z))
+            costs = dg.get_costs(n_nodes=args.n_nodes, zipf_coeffs=z)[:args.n_seats]
+            
+            _, _, _, attacker_cost, selected_seats, _ = opt.optimize(n_seats=args.n_seats,
+                    alpha=ALPHA, costs=costs, weights=WEIGHTS, mode=args.mode,
+                    solver_name=args.solver, verbose=args.verbose, model=model, cache=cache,
+                    warm_start=selected_seats, epsilon=args.epsilon)
+
+            attacker_costs[i] = attacker_cost
+            save(writer, s=z, cost=attacker_cost)
+
+    if gaps is not None:
+        print('Maximum relative gap to the LP relaxation bound: {:.3g}'.format(gaps.max()))
+
+    if tu.stats.enabled:
+        tu.stats.report()
+        if args.timing:
+            tu.stats.save(args.timing)
     
-    if args.csv:
-        data = {'s': zipf_coeffs, 'cost': attacker_costs}
-        df = pd.DataFrame(data)
-
-        fname = '{}_cost.csv'.format(args.mode)
-        if os.path.isfile(fname):
-            print('File {} exists: o - overwrite, n - enter new file name, c - cancel saving data'.\
-                    format(fname))
-
-            i = input('Enter your choice: ')
-            if i == 'o':
-                df.to_csv(fname, index=False)
-                print('Data saved in {}'.format(fname))
-            elif i == 'n':
-                fname = input('Type new file name: ')
-                while not fname or fname == 'costs.csv':
-                    fname = input('Type new file name: ')
-
-                df.to_csv(fname, index=False)
-                print('Data saved in {}'.format(fname))
-            else:
-                print('Data has not been be saved')
-        else:
-            df.to_csv(fname, index=False)
-            print('Data saved in {}'.format(fname))
+    if writer is not None:
+        writer.close()
+        if writer.fname != fname:
+            data = {'s': zipf_coeffs, 'cost': attacker_costs}
+            if gaps is not None:
+                data['gap'] = gaps
+            io.save_table(fname=fname, data=data)
+            # the run is complete, its checkpoint is no longer needed
+            os.remove(writer.fname)
+        print('Data saved in {}'.format(fname))
+
+    if args.hide_plots:
+        return
+
+    import matplotlib.pyplot as plt
 
     if args.latex:
         plt.rcParams['font.size'] = 11
@@ -76,8 +176,7 @@ def main():
     plt.xlabel('Zipf coefficient')
     plt.ylabel('Attacker cost')
 
-    if not args.hide_plots:
-        plt.show()
+    plt.show()
     
 
 if __name__ == '__main__':
@@ -1,68 +1,252 @@
 # Calculates attacker cost as a function of Zipf coefficient and k in k-scheme
 
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 
 from src.parsers import attacker_cost_k_parser
 import src.data_gen as dg
+import src.io_utils as io
 import src.opt_utils as opt
+import src.cache_utils as cu
+import src.timing_utils as tu
+
+
+# persistent models, the cache and the last optimum for every k, reused by the cells solved in
+# this process
+_models = {}
+_caches = {}
+_previous = {}
+
+
+def get_cache(args):
+    if args.cache_dir not in _caches:
+        _caches[args.cache_dir] = cu.get_cache(cache_dir=args.cache_dir,
+                cache_size=args.cache_size)
+    return _caches[args.cache_dir]
+
+
+def get_alpha(mode):
+    return 1.0 / 3 if mode == 'stop' else 2.0 / 3
+
+
+def solve_row(args, k, zipf_coeffs):
+    '''
+    Solves all Zipf coefficients for a given k at once with the batch DP solver
+    '''
+    if args.verbose:
+        print('Solving problems for k={:d} and {} values of zipfc'.format(k, len(zipf_coeffs)))
+    weights = dg.get_voting_power(n_seats=args.n_seats, k=k)
+    costs = dg.get_costs_batch(n_nodes=args.n_nodes, zipf_coeffs=zipf_coeffs, n_seats=args.n_seats)
+
+    attacker_costs, _ = opt.solve_dp_batch(alpha=get_alpha(args.mode), costs=costs,
+            weights=weights, mode=args.mode, cache=get_cache(args))
+
+    return attacker_costs
+
+
+def sweep_row(args, k, zipf_coeffs):
+    '''
+    Finds the breakpoints of the optimal selection along zipf_coeffs for a given k and evaluates
+    the attacker cost in closed form between them
+    '''
+    if args.verbose:
+        print('Searching breakpoints for k={:d}'.format(k))
+    weights = dg.get_voting_power(n_seats=args.n_seats, k=k)
+    get_costs = lambda s: dg.get_costs(n_nodes=args.n_nodes, zipf_coeffs=s)[:args.n_seats]
+    solve = lambda costs: opt.optimize(n_seats=args.n_seats, alpha=get_alpha(args.mode),
+            costs=costs, weights=weights, mode=args.mode, solver_name=args.solver,
+            verbose=args.verbose, cache=get_cache(args), epsilon=args.epsilon)[4]
+
+    breakpoints, selections = opt.parametric_sweep(get_costs=get_costs, solve=solve,
+            s_min=zipf_coeffs[0], s_max=zipf_coeffs[-1])
+    if args.verbose:
+        print('Optimal selection for k={:d} changes at zipfc: {}'.format(k, breakpoints))
+
+    return opt.evaluate_sweep(get_costs=get_costs, breakpoints=breakpoints,
+            selections=selections, s=zipf_coeffs)
+
+
+def get_model(args, weights):
+    # one model per process for the whole sweep, only its parameters change
+    if args.solver not in _models:
+        _models[args.solver] = opt.get_persistent_model(n_seats=args.n_seats,
+                alpha=get_alpha(args.mode), weights=weights, mode=args.mode,
+                solver_name=args.solver)
+    return _models[args.solver]
+
+
+def approx_row(args, k, zipf_coeffs):
+    '''
+    Solves all Zipf coefficients for a given k approximately, exactly where the gap exceeds the
+    tolerance, returns the attacker costs and the gaps
+    '''
+    if args.verbose:
+        print('Solving problems approximately for k={:d}'.format(k))
+    weights = dg.get_voting_power(n_seats=args.n_seats, k=k)
+    attacker_costs = np.empty_like(zipf_coeffs)
+    gaps = np.empty_like(zipf_coeffs)
+
+    for i, s in enumerate(zipf_coeffs):
+        costs = dg.get_costs(n_nodes=args.n_nodes, zipf_coeffs=s)[:args.n_seats]
+        result, gaps[i] = opt.optimize_approx(n_seats=args.n_seats, alpha=get_alpha(args.mode),
+                costs=costs, weights=weights, mode=args.mode, solver_name=args.solver,
+                verbose=args.verbose, tol=args.approx, model=get_model(args, weights),
+                cache=get_cache(args), epsilon=args.epsilon)
+        attacker_costs[i] = result[3]
+
+    return attacker_costs, gaps
+
+
+def solve_cell(args, k, s):
+    '''
+    Solves the problem for a single cell (k, s) of the grid
+    '''
+    if args.verbose:
+        print('Solving problem for k={:d}, zipfc={:.2f}'.format(k, s))
+    weights = dg.get_voting_power(n_seats=args.n_seats, k=k)
+    costs = dg.get_costs(n_nodes=args.n_nodes, zipf_coeffs=s)[:args.n_seats]
+
+    # cells of a chunk are neighbours in s, so the previous optimum for k is a good warm start
+    _, _, _, attacker_cost, _previous[k], _ = opt.optimize(n_seats=args.n_seats,
+            alpha=get_alpha(args.mode), costs=costs, weights=weights, mode=args.mode,
+            solver_name=args.solver, verbose=args.verbose, model=get_model(args, weights),
+            cache=get_cache(args), warm_start=_previous.get(k), epsilon=args.epsilon)
+
+    return attacker_cost
+
+
+def run_task(f, args, *params):
+    '''
+    Runs a task of the grid, returns its result and the timing records it produced
+    '''
+    if args.timing:
+        tu.stats.enable()
+    return f(args, *params), tu.stats.pop()
 
 
 def main():
     args = attacker_cost_k_parser().parse_args()
+    if args.timing:
+        tu.stats.enable()
 
-    ALPHA = 1.0 / 3 if args.mode == 'stop' else 2.0 / 3
     ZIPF_COEFFS = np.arange(start=args.zipfc_min, stop=args.zipfc_max + args.zipfc_step,
             step=args.zipfc_step)
+    K = np.arange(1, args.k_max + 1)
     attacker_costs_k = {}
+    gaps_k = {}
+
+    grid = np.empty((len(K), len(ZIPF_COEFFS)))
+    gaps = None if args.approx is None else np.empty_like(grid)
 
-    for k in range(1, args.k_max + 1):
-        weights = dg.get_voting_power(n_seats=args.n_seats, k=k)
-        attacker_costs = np.empty_like(ZIPF_COEFFS)
+    # cells of the grid are appended to a long checkpoint file as they are solved, so an
+    # interrupted run can be resumed; the wide file is written from it at the end
+    fname = None
+    writer = None
+    if args.csv:
+        io.check_format(args.format)
+        checkpoint = '{}_cost_k.checkpoint.csv'.format(args.mode)
+        if os.path.isfile(checkpoint) and not args.resume:
+            sys.exit('Checkpoint {} of an interrupted run exists, pass --resume to continue it '
+                    'or remove it'.format(checkpoint))
+        fname = io.get_fname('{}_cost_k.{}'.format(args.mode, args.format),
+                if_exists=args.if_exists)
+        if fname is not None:
+            writer = io.CsvWriter(fname=checkpoint, fieldnames=['k', 's', 'cost'] + \
+                    ([] if gaps is None else ['gap']), resume=args.resume)
 
+    # cells the checkpoint already holds are not solved again
+    done = {} if writer is None else \
+            {(int(row['k']), round(row['s'], 9)): row for row in writer.rows}
+    todo = {}
+    for j, k in enumerate(K):
+        todo[k] = []
         for i, s in enumerate(ZIPF_COEFFS):
-            if args.verbose:
-                print('Solving problem for k={:d}, zipfc={:.2f}'.format(k, s))
-            costs = dg.get_costs(n_nodes=args.n_nodes, zipf_coeffs=s)[:args.n_seats]
-            
-            model = opt.get_model(n_seats=args.n_seats, alpha=ALPHA, costs=costs, weights=weights,
-                    mode=args.mode)
+            row = done.get((k, round(s, 9)))
+            if row is None:
+                todo[k] += [i]
+                continue
+            grid[j, i] = row['cost']
+            if gaps is not None:
+                gaps[j, i] = row['gap']
+
+    def save(k, i, cost, gap=None):
+        grid[k - 1, i] = cost
+        row = {'k': k, 's': ZIPF_COEFFS[i], 'cost': cost}
+        if gap is not None:
+            gaps[k - 1, i] = gap
+            row['gap'] = gap
+        if writer is not None:
+            writer.write(row)
+
+    row_tasks = [k for k in K if todo[k]]
+    row_coeffs = [ZIPF_COEFFS[todo[k]] for k in row_tasks]
+    cells = [(k, i) for k in K for i in todo[k]]
 
-            _, _, _, attacker_cost, _, _ = opt.solve(model=model, solver_name=args.solver,
-                    verbose=args.verbose)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # map returns results in the order of the grid regardless of the worker finishing first;
+        # contiguous chunks of cells keep the same k in a worker so its model rarely changes
+        # weights, while there are only k_max rows, so they are sent to the workers one by one
+        row_mapper = partial(pool.map, chunksize=1) if args.workers > 1 else map
+        chunksize = max(len(cells) // (4 * args.workers), 1)
+        mapper = partial(pool.map, chunksize=chunksize) if args.workers > 1 else map
 
-            attacker_costs[i] = attacker_cost
+        # results are saved as soon as they arrive
+        if args.approx is not None:
+            results = row_mapper(run_task, repeat(approx_row), repeat(args), row_tasks,
+                    row_coeffs)
+            for k, ((attacker_costs, row_gaps), records) in zip(row_tasks, results):
+                for i, cost, gap in zip(todo[k], attacker_costs, row_gaps):
+                    save(k, i, cost, gap)
+                tu.stats.extend(records)
+        elif args.parametric or args.solver == 'dp':
+            f = sweep_row if args.parametric else solve_row
+            results = row_mapper(run_task, repeat(f), repeat(args), row_tasks, row_coeffs)
+            for k, (attacker_costs, records) in zip(row_tasks, results):
+                for i, cost in zip(todo[k], attacker_costs):
+                    save(k, i, cost)
+                tu.stats.extend(records)
+        else:
+            results = mapper(run_task, repeat(solve_cell), repeat(args),
+                    [k for k, _ in cells], [ZIPF_COEFFS[i] for _, i in cells])
+            for (k, i), (attacker_cost, records) in zip(cells, results):
+                save(k, i, attacker_cost)
+                tu.stats.extend(records)
+
+    for k, attacker_costs in zip(K, grid):
         attacker_costs_k['k={:d}'.format(k)] = attacker_costs
+    if gaps is not None:
+        for k, row_gaps in zip(K, gaps):
+            gaps_k['k={:d}'.format(k)] = row_gaps
+
+    if gaps is not None:
+        print('Maximum relative gap to the LP relaxation bound: {:.3g}'.format(gaps.max()))
+
+    if tu.stats.enabled:
+        tu.stats.report()
+        if args.timing:
+            tu.stats.save(args.timing)
     
-    if args.csv:
+    if writer is not None:
         data = {'s': ZIPF_COEFFS}
         for k, v in attacker_costs_k.items():
             data['cost for ' + k] = v
-        df = pd.DataFrame(data)
-
-        fname = '{}_cost_k.csv'.format(args.mode)
-        if os.path.isfile(fname):
-            print('File {} exists: o - overwrite, n - enter new file name, c - cancel saving data'.\
-                    format(fname))
-
-            i = input('Enter your choice: ')
-            if i == 'o':
-                df.to_csv(fname, index=False)
-                print('Data saved in {}'.format(fname))
-            elif i == 'n':
-                fname = input('Type new file name: ')
-                while not fname or fname == 'costs.csv':
-                    fname = input('Type new file name: ')
-
-                df.to_csv(fname, index=False)
-                print('Data saved in {}'.format(fname))
-            else:
-                print('Data has not been be saved')
-        else:
-            df.to_csv(fname, index=False)
-            print('Data saved in {}'.format(fname))
+        for k, v in gaps_k.items():
+            data['gap for ' + k] = v
+
+        io.save_table(fname=fname, data=data)
+        writer.close()
+        # the run is complete, its checkpoint is no longer needed
+        os.remove(writer.fname)
+        print('Data saved in {}'.format(fname))
+
+    if args.hide_plots:
+        return
+
+    import matplotlib.pyplot as plt
 
     if args.latex:
         plt.rcParams['font.size'] = 11
@@ -85,13 +269,12 @@ def main():
     plt.ylabel('Attacker cost')
     plt.legend()
 
-    if not args.hide_plots:
-        plt.show()
-        # d = np.empty(shape=(len(attacker_costs_k['k=1']), len(attacker_costs_k)))
-        # for i, v in enumerate(attacker_costs_k.values()):
-            # d[:, i] = v
-        # _, _ = heatmap(data=d, row_labels=ZIPF_COEFFS, col_labels=np.arange(1, args.k_max + 1))
-        # plt.show()
+    plt.show()
+    # d = np.empty(shape=(len(attacker_costs_k['k=1']), len(attacker_costs_k)))
+    # for i, v in enumerate(attacker_costs_k.values()):
+        # d[:, i] = v
+    # _, _ = heatmap(data=d, row_labels=ZIPF_COEFFS, col_labels=np.arange(1, args.k_max + 1))
+    # plt.show()
     
 
 if __name__ == '__main__':
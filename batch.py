@@ -0,0 +1,130 @@
+# Solves many scenarios of the main script in one process, optionally across a pool of workers,
+# and streams one result row per scenario
+
+import contextlib
+import csv
+import io
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from src.parsers import main_parser, batch_parser
+import src.cache_utils as cu
+import main as scenario
+
+
+# options of a scenario copied to its result row
+SCENARIO_KEYS = ['n_nodes', 'n_seats', 'mode', 'data', 'zipfc', 'k', 'seed', 'solver']
+RESULT_KEYS = ['min_power', 'power', 'cost', 'seats', 'error']
+
+# cache of the worker process, set by init_worker
+_cache = None
+
+
+def read_scenarios(fname):
+    '''
+    Reads the scenarios of a JSONL or CSV file
+    Parameters:
+        - fname: str, name of the file, JSONL unless its extension is csv
+    Returns:
+        - list of dicts, options of the main script of every scenario
+    '''
+    with open(fname, newline='') as f:
+        if fname.lower().endswith('.csv'):
+            return list(csv.DictReader(f))
+        return [json.loads(l) for l in f if l.strip()]
+
+
+def get_args(parser, options):
+    '''
+    Parses the options of a scenario as if they were given to the main script on the command line
+    Parameters:
+        - parser: parser of the main script
+        - options: dict, values of the options without the leading dashes, True for flags
+    Returns:
+        - args, class 'argparse.Namespace'
+    '''
+    argv = []
+    for key, value in options.items():
+        # empty CSV cells and false flags leave the option at its default
+        if value is None or value is False or value == '':
+            continue
+        argv += ['--' + key] if value is True else ['--' + key, str(value)]
+
+    return parser.parse_args(argv)
+
+
+def init_worker(cache_dir, cache_size):
+    global _cache
+    _cache = cu.get_cache(cache_dir=cache_dir, cache_size=cache_size)
+
+
+def solve_scenario(item):
+    '''
+    Solves a scenario, failures are reported in the error column instead of stopping the batch
+    '''
+    i, args = item
+    row = {'scenario': i}
+    row.update({key: getattr(args, key) for key in SCENARIO_KEYS})
+
+    # solvers print their messages and call exit() when they fail, so their output is kept off the
+    # result rows and its last line becomes the error
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            costs, weights = scenario.get_data(args)
+            _, min_power, power, cost, seats, _ = scenario.solve(args=args, costs=costs,
+                    weights=weights, cache=_cache)
+        row.update({'min_power': min_power, 'power': power, 'cost': cost,
+            'seats': ' '.join(str(s) for s in seats)})
+    except (Exception, SystemExit) as e:
+        message = str(e)
+        if isinstance(e, SystemExit) and not isinstance(e.code, str):
+            lines = out.getvalue().strip().splitlines()
+            message = lines[-1] if lines else ''
+        row['error'] = type(e).__name__ + (': {}'.format(message) if message else '')
+    finally:
+        sys.stderr.write(out.getvalue())
+
+    return row
+
+
+def main():
+    args = batch_parser().parse_args()
+
+    # check every scenario before solving any, so a typo does not stop a long run halfway
+    parser = main_parser()
+    scenarios = []
+    for i, options in enumerate(read_scenarios(args.jobs), start=1):
+        try:
+            scenarios += [(i, get_args(parser=parser, options=options))]
+        except SystemExit:
+            sys.exit('Invalid scenario {} in {}'.format(i, args.jobs))
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    writer = csv.DictWriter(out, fieldnames=['scenario'] + SCENARIO_KEYS + RESULT_KEYS)
+    writer.writeheader()
+
+    n_failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+            initargs=(args.cache_dir, args.cache_size)) as pool:
+        if args.workers > 1:
+            rows = pool.map(solve_scenario, scenarios, chunksize=args.chunksize)
+        else:
+            init_worker(cache_dir=args.cache_dir, cache_size=args.cache_size)
+            rows = map(solve_scenario, scenarios)
+
+        # rows are written in the order of the scenarios as soon as they are solved
+        for row in rows:
+            writer.writerow(row)
+            out.flush()
+            n_failed += 'error' in row
+
+    if out is not sys.stdout:
+        out.close()
+        print('Solved {} scenarios, {} failed, results saved in {}'.format(len(scenarios),
+            n_failed, args.output))
+
+
+if __name__ == '__main__':
+    main()
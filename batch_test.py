@@ -0,0 +1,66 @@
+# Checks that batch.py reports failed scenarios in the error column and keeps solving the others,
+# run with pytest or as a script
+
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import batch
+from src.parsers import main_parser
+import src.opt_utils as ou
+
+
+SCENARIO = {'n_nodes': 200, 'n_seats': 30, 'mode': 'stop', 'solver': 'dp'}
+
+
+def solve(options):
+    return batch.solve_scenario((1, batch.get_args(main_parser(), options)))
+
+
+def test_solve_scenario():
+    row = solve(SCENARIO)
+    assert 'error' not in row and row['power'] >= row['min_power']
+
+    # fractional voting power given to a solver that needs integers
+    row = solve(dict(SCENARIO, data='stake'))
+    assert row['error'] == 'ValueError: Native solvers require non-negative integer voting power'
+
+    # solvers print a message and exit on infeasible models
+    def exit_infeasible(*args, **kwargs):
+        print('The model is infeasible')
+        exit()
+
+    dp = ou.NATIVE_SOLVERS['dp']
+    try:
+        ou.NATIVE_SOLVERS['dp'] = exit_infeasible
+        assert solve(SCENARIO)['error'] == 'SystemExit: The model is infeasible'
+        ou.NATIVE_SOLVERS['dp'] = lambda *args, **kwargs: exit()
+        assert solve(SCENARIO)['error'] == 'SystemExit'
+    finally:
+        ou.NATIVE_SOLVERS['dp'] = dp
+
+
+def test_batch():
+    scenarios = [SCENARIO, dict(SCENARIO, data='stake'), dict(SCENARIO, mode='overtake', k=2)]
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = os.path.join(tmp, 'jobs.jsonl')
+        with open(jobs, 'w') as f:
+            f.writelines(json.dumps(s) + '\n' for s in scenarios)
+
+        for workers in ['1', '2']:
+            # results on the standard output are not mixed with messages of the solvers
+            out = subprocess.run([sys.executable, 'batch.py', '--jobs', jobs, '--output', '-',
+                '--workers', workers], capture_output=True, text=True, check=True,
+                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+            rows = list(csv.DictReader(out.splitlines()))
+            assert [row['scenario'] for row in rows] == ['1', '2', '3']
+            assert [bool(row['error']) for row in rows] == [False, True, False]
+
+
+if __name__ == '__main__':
+    for test in [test_solve_scenario, test_batch]:
+        test()
+        print('{} passed'.format(test.__name__))
@@ -0,0 +1,206 @@
+# Times data generation, model building, solving and whole sweeps for several committee sizes
+# and solver backends, saves the results to JSON and compares them with a baseline
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from functools import partial
+import numpy as np
+import pyomo
+import pyomo.environ as pe
+
+from src.parsers import benchmark_parser
+import src.data_gen as dg
+import src.lp_utils as lu
+import src.opt_utils as opt
+
+
+# largest DP table (seats x voting power) to allocate, in entries
+MAX_DP_TABLE = 2**30
+
+
+def timeit(f, repeats):
+    '''
+    Returns the fastest of repeats runs of f in seconds
+    '''
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def is_available(solver_name):
+    if solver_name in opt.LP_SOLVERS:
+        return lu.is_available(solver_name[len('lp_'):])
+    if solver_name in opt.NATIVE_SOLVERS:
+        return True
+    return solver_name in pe.SolverFactory and \
+            pe.SolverFactory(solver_name).available(exception_flag=False)
+
+
+def run_script(script, n_seats, solver_name, args):
+    cmd = [sys.executable, script, '--n_nodes', str(n_seats), '--n_seats', str(n_seats),
+            '--mode', args.mode, '--solver', solver_name, '--zipfc_step', '0.1', '--hide_plots']
+    if script == 'attacker_cost_k.py':
+        cmd += ['--k_max', str(args.k)]
+    env = dict(os.environ, MPLBACKEND='Agg')
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__)), env=env)
+
+
+# short runs of the command line scripts that must not load heavy dependencies
+STARTUP_RUNS = {
+        'main.py': ['--n_nodes', '10', '--n_seats', '10', '--solver', 'dp', '--novis'],
+        'attacker_cost.py': ['--n_nodes', '10', '--n_seats', '10', '--solver', 'dp',
+            '--zipfc_step', '0.5', '--hide_plots'],
+        'attacker_cost_k.py': ['--n_nodes', '10', '--n_seats', '10', '--solver', 'dp',
+            '--zipfc_step', '0.5', '--k_max', '1', '--hide_plots'],
+        'costs.py': ['--n_nodes', '10', '--hide_plots'],
+        }
+HEAVY_MODULES = ['pandas', 'matplotlib', 'networkx', 'pyomo']
+
+
+def run_startup(script, args):
+    cmd = [sys.executable, script] + STARTUP_RUNS[script]
+    if script != 'costs.py':
+        cmd += ['--mode', args.mode]
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_heavy_imports(script):
+    '''
+    Returns the heavy dependencies a script loads at import, i.e. before parsing its arguments
+    '''
+    code = 'import sys, {}; print(" ".join(m for m in {!r} if m in sys.modules))'.format(
+            script[:-len('.py')], HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True,
+            text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return result.stdout.split()
+
+
+def get_benchmarks(args, solvers):
+    '''
+    Yields (name, solver name, n_seats, function to time) for every benchmark. The functions
+    bind their arguments when yielded, so they may be collected before being timed
+    '''
+    alpha = 1.0 / 3 if args.mode == 'stop' else 2.0 / 3
+
+    # start-up time dominates the short runs of the scripts made by orchestration jobs
+    for script in STARTUP_RUNS:
+        yield script, 'startup', 10, partial(run_startup, script, args)
+
+    for n_seats in sorted(args.sizes):
+        costs = dg.get_costs(n_nodes=n_seats, zipf_coeffs=1.0)
+        weights = dg.get_voting_power(n_seats=n_seats, k=args.k)
+
+        yield 'get_costs', '', n_seats, partial(dg.get_costs, n_nodes=n_seats, zipf_coeffs=1.0)
+        yield 'get_voting_power', '', n_seats, \
+                partial(dg.get_voting_power, n_seats=n_seats, k=args.k)
+        yield 'get_model', '', n_seats, lambda n_seats=n_seats, costs=costs, weights=weights: \
+                opt.get_model(n_seats=n_seats, alpha=alpha, costs=costs, weights=weights,
+                        mode=args.mode).create_instance()
+
+        for solver_name in solvers:
+            if solver_name == 'dp' and \
+                    n_seats * opt.get_min_power(alpha, weights, args.mode) > MAX_DP_TABLE:
+                continue
+            # the DP of fptas has a budget of 2 * n_seats / epsilon scaled costs, epsilon = 0.01
+            if solver_name == 'fptas' and n_seats * 200 * n_seats > MAX_DP_TABLE:
+                continue
+            yield 'solve', solver_name, n_seats, partial(opt.optimize, n_seats=n_seats,
+                    alpha=alpha, costs=costs, weights=weights, mode=args.mode,
+                    solver_name=solver_name, verbose=False)
+
+            if n_seats <= args.sweep_max_seats:
+                for script in ['attacker_cost.py', 'attacker_cost_k.py']:
+                    yield script, solver_name, n_seats, \
+                            partial(run_script, script, n_seats, solver_name, args)
+
+
+def compare(results, baseline, tolerance):
+    '''
+    Prints the ratio of every timing to the baseline, returns the number of regressions
+    '''
+    old = {(r['name'], r['solver'], r['n_seats']): r['seconds'] for r in baseline['results']}
+    regressions = 0
+
+    print()
+    print('{:<20} {:<12} {:>8} {:>12} {:>12} {:>8}'.format('benchmark', 'solver', 'seats',
+        'baseline, s', 'current, s', 'ratio'))
+    for r in results:
+        key = (r['name'], r['solver'], r['n_seats'])
+        if key not in old:
+            continue
+        ratio = r['seconds'] / old[key]
+        flag = ''
+        if ratio > tolerance:
+            flag = ' REGRESSION'
+            regressions += 1
+        print('{:<20} {:<12} {:>8} {:>12.6f} {:>12.6f} {:>8.2f}{}'.format(*key, old[key],
+            r['seconds'], ratio, flag))
+
+    return regressions
+
+
+def main():
+    args = benchmark_parser().parse_args()
+
+    solvers = [s for s in args.solvers if is_available(s)]
+    skipped = sorted(set(args.solvers) - set(solvers))
+    if skipped:
+        print('Skipping unavailable solvers:', ' '.join(skipped))
+
+    heavy = {script: get_heavy_imports(script) for script in STARTUP_RUNS}
+    for script, modules in heavy.items():
+        if modules:
+            print('{} imports {} at start-up'.format(script, ' '.join(modules)))
+
+    results = []
+    # benchmarks that exceeded the budget, larger sizes are skipped for them
+    exceeded = set()
+
+    for name, solver_name, n_seats, f in get_benchmarks(args, solvers):
+        if (name, solver_name) in exceeded:
+            continue
+        seconds = timeit(f, repeats=args.repeats)
+        if seconds > args.budget:
+            exceeded.add((name, solver_name))
+        results += [{'name': name, 'solver': solver_name, 'n_seats': n_seats,
+            'seconds': seconds}]
+        print('{:<20} {:<12} {:>8} {:>12.6f} s'.format(name, solver_name, n_seats, seconds))
+
+    data = {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'numpy': np.__version__,
+            'pyomo': pyomo.version.version,
+            'mode': args.mode,
+            'k': args.k,
+            'repeats': args.repeats,
+            'results': results,
+            'startup_imports': heavy,
+            }
+    with open(args.output, 'w') as f:
+        json.dump(data, f, indent=2)
+    print('Results saved in {}'.format(args.output))
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print('{} benchmarks are slower than the baseline'.format(regressions))
+            sys.exit(1)
+
+    if any(heavy.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+# Cross-checks the exact and approximate solvers against enumeration of every selection of seats on
+# small random committees, run with pytest or as a script
+
+import numpy as np
+
+from src.data_gen import get_voting_power
+import src.lp_utils as lu
+import src.opt_utils as ou
+
+
+MAX_SEATS = 10
+N_INSTANCES = 200
+MODES = [('stop', 1/3), ('overtake', 2/3)]
+
+
+def get_instances(seed):
+    '''
+    Generates small committees whose voting power follows the k-scheme or is random, with a few
+    seats of equal cost so ties are covered
+    '''
+    rng = np.random.default_rng(seed)
+    for _ in range(N_INSTANCES):
+        n_seats = rng.integers(1, MAX_SEATS + 1)
+        costs = rng.random(n_seats)
+        costs[rng.integers(n_seats, size=2)] = costs[0]
+        # for k > 1 the k-scheme gives voting power to every seat of even committees only
+        if n_seats % 2 == 0 and rng.random() < 0.5:
+            weights = get_voting_power(n_seats, rng.integers(1, n_seats + 1))
+        else:
+            weights = rng.integers(0, 6, size=n_seats)
+        for mode, alpha in MODES:
+            yield n_seats, alpha, costs, weights, mode
+
+
+def get_feasible(alpha, weights, mode):
+    '''
+    Returns every selection of seats reaching the voting power required, one per row, and the
+    voting power of each
+    '''
+    n_seats = len(weights)
+    x = (np.arange(2**n_seats)[:, None] >> np.arange(n_seats) & 1).astype(bool)
+    power = x @ weights
+    feasible = power >= alpha * weights.sum() + ou._get_eps(mode) - 1e-9
+    return x[feasible], power[feasible]
+
+
+def test_exact_solvers():
+    for n_seats, alpha, costs, weights, mode in get_instances(seed=1):
+        x, _ = get_feasible(alpha, weights, mode)
+        if len(x) == 0:
+            continue
+        optimum = (x @ costs).min()
+        for solver in [ou.solve_dp, ou.solve_kscheme]:
+            solution, _, power, cost, _, _ = solver(n_seats=n_seats, alpha=alpha, costs=costs,
+                    weights=weights, mode=mode)
+            assert np.isclose(cost, optimum), (solver.__name__, costs, weights, mode)
+            assert any((x == solution.x).all(axis=1))
+            assert power == weights[solution.x].sum()
+
+
+def test_dp_batch():
+    rng = np.random.default_rng(7)
+    for n_seats, alpha, costs, weights, mode in get_instances(seed=7):
+        x, _ = get_feasible(alpha, weights, mode)
+        if len(x) == 0:
+            continue
+        # rows of costs sharing the voting power, in chunks of one row and of all rows
+        rows = np.vstack([costs, rng.random((4, n_seats))])
+        optima = (x @ rows.T).min(axis=0)
+        for max_table_size in [1, 2**20]:
+            attacker_costs, selected = ou.solve_dp_batch(alpha=alpha, costs=rows,
+                    weights=weights, mode=mode, max_table_size=max_table_size)
+            assert np.allclose(attacker_costs, optima), (rows, weights, mode)
+            for r in range(len(rows)):
+                assert any((x == selected[r]).all(axis=1))
+                assert np.isclose(rows[r, selected[r]].sum(), attacker_costs[r])
+
+
+def test_top_solutions():
+    for n_seats, alpha, costs, weights, mode in get_instances(seed=2):
+        x, _ = get_feasible(alpha, weights, mode)
+        if len(x) == 0:
+            continue
+        top_k = min(5, len(x))
+        solutions = ou.get_top_solutions(alpha=alpha, costs=costs, weights=weights, mode=mode,
+                top_k=top_k + 1)
+        # there are only len(x) feasible selections
+        assert len(solutions) == min(top_k + 1, len(x))
+        assert np.allclose([cost for cost, _, _ in solutions[:top_k]],
+                np.sort(x @ costs)[:top_k])
+
+        selections = set()
+        for cost, power, seats in solutions:
+            selected = np.zeros(n_seats, dtype=bool)
+            selected[np.asarray(seats, dtype=int) - 1] = True
+            assert any((x == selected).all(axis=1))
+            assert np.isclose(cost, costs[selected].sum())
+            assert power == weights[selected].sum()
+            selections.add(tuple(seats))
+        assert len(selections) == len(solutions)
+
+    # tables larger than max_table_size are refused before they are allocated
+    try:
+        ou.get_top_solutions(alpha=1/3, costs=np.ones(30), weights=np.ones(30), mode='stop',
+                top_k=2, max_table_size=31 * 10)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('the table of 31 * 11 entries must be refused')
+
+
+def test_sensitivity():
+    for n_seats, alpha, costs, weights, mode in get_instances(seed=3):
+        x, _ = get_feasible(alpha, weights, mode)
+        if len(x) == 0:
+            continue
+        forced_in, forced_out = ou.get_sensitivity(alpha=alpha, costs=costs, weights=weights,
+                mode=mode)
+        for i in range(n_seats):
+            # a superset of a feasible selection is feasible, so some selection takes seat i
+            assert np.isclose(forced_in[i], (x[x[:, i]] @ costs).min())
+            out = x[~x[:, i]] @ costs
+            assert forced_out[i] == np.inf if len(out) == 0 else np.isclose(forced_out[i],
+                    out.min())
+
+    # tables larger than max_table_size are refused before they are allocated
+    try:
+        ou.get_sensitivity(alpha=1/3, costs=np.ones(30), weights=np.ones(30), mode='stop',
+                max_table_size=30 * 10)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('the table of 30 * 11 entries must be refused')
+
+
+def test_fptas():
+    rng = np.random.default_rng(4)
+    for n_seats, alpha, costs, weights, mode in get_instances(seed=4):
+        # fractional stakes as well as integer voting power
+        for w in [weights, weights * rng.random(n_seats)]:
+            x, _ = get_feasible(alpha, w, mode)
+            if len(x) == 0:
+                continue
+            optimum = (x @ costs).min()
+            for epsilon in [0.5, 0.01]:
+                solution, _, _, cost, _, _ = ou.solve_fptas(n_seats=n_seats, alpha=alpha,
+                        costs=costs, weights=w, mode=mode, epsilon=epsilon)
+                assert any((x == solution.x).all(axis=1))
+                assert cost <= (1 + epsilon) * optimum + 1e-12, (costs, w, mode, epsilon)
+
+
+def test_approx_fptas():
+    for n_seats, alpha, costs, weights, mode in get_instances(seed=5):
+        x, _ = get_feasible(alpha, weights, mode)
+        if len(x) == 0:
+            continue
+        optimum = (x @ costs).min()
+        for epsilon in [0.5, 0.01]:
+            # tol 0 escalates to fptas whenever the greedy selection is not certified
+            result, gap = ou.optimize_approx(n_seats=n_seats, alpha=alpha, costs=costs,
+                    weights=weights, mode=mode, solver_name='fptas', verbose=False, tol=0,
+                    epsilon=epsilon)
+            cost = result[3]
+            assert gap <= epsilon
+            assert cost - optimum <= gap * cost + 1e-12, (costs, weights, mode, epsilon)
+
+
+def test_approx():
+    # the MIP solvers run on LP files need their executable
+    solvers = [name for name in ou.NATIVE_SOLVERS if not name.startswith('lp_') or
+            lu.is_available(name[3:])]
+    for n_seats, alpha, costs, weights, mode in get_instances(seed=6):
+        x, _ = get_feasible(alpha, weights, mode)
+        if len(x) == 0:
+            continue
+        optimum = (x @ costs).min()
+        for solver_name in solvers:
+            for tol in [0, 0.05, 0.5]:
+                result, gap = ou.optimize_approx(n_seats=n_seats, alpha=alpha, costs=costs,
+                        weights=weights, mode=mode, solver_name=solver_name, verbose=False,
+                        tol=tol)
+                cost = result[3]
+                assert cost - optimum <= gap * cost + 1e-12, (solver_name, costs, weights, mode)
+                assert any((x == result[0].x).all(axis=1))
+
+
+if __name__ == '__main__':
+    for test in [test_exact_solvers, test_dp_batch, test_top_solutions, test_sensitivity, test_fptas,
+            test_approx_fptas, test_approx]:
+        test()
+        print('{} passed'.format(test.__name__))
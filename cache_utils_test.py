@@ -0,0 +1,87 @@
+# Checks hits, size accounting and eviction of the on-disk cache of solved problems, run with
+# pytest or as a script
+
+import os
+import tempfile
+
+import numpy as np
+
+import src.cache_utils as cu
+
+
+COSTS = np.array([0.1, 0.2, 0.3])
+WEIGHTS = np.array([1, 2, 3])
+
+
+def get_key(i):
+    return cu.SolveCache.key(costs=COSTS, weights=WEIGHTS, alpha=i / 100, mode='stop',
+            solver_name='dp')
+
+
+def disk_size(cache):
+    return sum(e.stat().st_size for e in os.scandir(cache.cache_dir) if e.name.endswith('.json'))
+
+
+def test_hits():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = cu.SolveCache(cache_dir)
+        key = get_key(1)
+        assert cache.get(key) is None
+        cache.put(key, attacker_cost=0.25, selected_seats=np.array([1, 3]))
+        assert cache.get(key) == (0.25, [1, 3])
+
+        # every part of the problem is in the key
+        assert len({key, get_key(2), cache.key(COSTS, WEIGHTS, 0.01, 'overtake', 'dp'),
+            cache.key(COSTS, WEIGHTS, 0.01, 'stop', 'kscheme'),
+            cache.key(COSTS[::-1], WEIGHTS, 0.01, 'stop', 'dp')}) == 5
+        assert cache.get(get_key(2)) is None
+
+        # a new cache on the same directory finds the entry and its size
+        cache = cu.SolveCache(cache_dir)
+        assert cache.get(key) == (0.25, [1, 3])
+        assert cache.size == disk_size(cache)
+
+
+def test_size():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = cu.SolveCache(cache_dir)
+        for i in range(5):
+            cache.put(get_key(i), attacker_cost=0.5, selected_seats=[1])
+        # writing an entry again replaces it
+        cache.put(get_key(0), attacker_cost=0.125, selected_seats=[1, 2, 3])
+        assert cache.size == disk_size(cache)
+        assert cache.get(get_key(0)) == (0.125, [1, 2, 3])
+
+
+def test_evict_to_low_water():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = cu.SolveCache(cache_dir)
+        cache.put(get_key(0), attacker_cost=0.5, selected_seats=[1])
+        entry_size = os.path.getsize(cache._path(get_key(0)))
+
+        # room for 10 entries, eviction leaves 8
+        cache = cu.SolveCache(cache_dir, max_size=10 * entry_size, low_water=0.8)
+        for i in range(10):
+            cache.put(get_key(i), attacker_cost=0.5, selected_seats=[1])
+            # entry i was used last at time i
+            os.utime(cache._path(get_key(i)), (i, i))
+        assert len(os.listdir(cache_dir)) == 10
+
+        # a hit makes entry 0 the most recently used one
+        assert cache.get(get_key(0)) is not None
+        cache.put(get_key(10), attacker_cost=0.5, selected_seats=[1])
+
+        kept = [i for i in range(11) if os.path.isfile(cache._path(get_key(i)))]
+        assert kept == [0, 4, 5, 6, 7, 8, 9, 10]
+        assert cache.size == disk_size(cache) == 8 * entry_size
+
+        # a full cache is not evicted again until it exceeds max_size
+        cache.put(get_key(11), attacker_cost=0.5, selected_seats=[1])
+        cache.put(get_key(12), attacker_cost=0.5, selected_seats=[1])
+        assert len(os.listdir(cache_dir)) == 10
+
+
+if __name__ == '__main__':
+    for test in [test_hits, test_size, test_evict_to_low_water]:
+        test()
+        print('{} passed'.format(test.__name__))
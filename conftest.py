@@ -0,0 +1,2 @@
+# kscheme_test.py plots the k-scheme and shows the figure when imported, it has no tests
+collect_ignore = ['kscheme_test.py']
@@ -1,49 +1,35 @@
-import os
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 
 from src.parsers import costs_parser
 import src.data_gen as dg
+import src.io_utils as io
 
 
 def main():
     args = costs_parser().parse_args()
+    fname = None
+    if args.csv:
+        io.check_format(args.format)
+        fname = io.get_fname('costs.{}'.format(args.format), if_exists=args.if_exists)
 
     zipf_coeffs = np.arange(start=args.zipfc_min, stop=args.zipfc_max + args.zipfc_step,
             step=args.zipfc_step)
 
-    costs = {}
-
-    for i, z in enumerate(zipf_coeffs):
-        cost = dg.get_costs(n_nodes=args.n_nodes, zipf_coeffs=z)#[:args.n_seats]
-        costs['s={:.1f}'.format(z)] = cost
+    costs_batch = dg.get_costs_batch(n_nodes=args.n_nodes, zipf_coeffs=zipf_coeffs,
+            dtype=np.float32 if args.float32 else np.float64)
+    costs = {'s={:.1f}'.format(z): cost for z, cost in zip(zipf_coeffs, costs_batch)}
 
-    if args.csv:
-        df = pd.DataFrame(costs)
-        df.insert(0, 'rank', np.arange(1, args.n_nodes + 1))
+    if fname is not None:
+        data = {'rank': np.arange(1, args.n_nodes + 1)}
+        data.update(costs)
 
-        fname = 'costs.csv'
-        if os.path.isfile(fname):
-            print('File {} exists: o - overwrite, n - enter new file name, c - cancel saving data'.\
-                    format(fname))
+        io.save_table(fname=fname, data=data)
+        print('Data saved in {}'.format(fname))
 
-            i = input('Enter your choice: ')
-            if i == 'o':
-                df.to_csv(fname, index=False)
-                print('Data saved in {}'.format(fname))
-            elif i == 'n':
-                fname = input('Type new file name: ')
-                while not fname or fname == 'costs.csv':
-                    fname = input('Type new file name: ')
+    if args.hide_plots:
+        return
 
-                df.to_csv(fname, index=False)
-                print('Data saved in {}'.format(fname))
-            else:
-                print('Data has not been saved')
-        else:
-            df.to_csv(fname, index=False)
-            print('Data saved in {}'.format(fname))
+    import matplotlib.pyplot as plt
 
     if args.latex:
         plt.rcParams['font.size'] = 11
@@ -65,8 +51,7 @@ def main():
     # plt.ylim([0, 0.05])
     plt.legend()
 
-    if not args.hide_plots:
-        plt.show()
+    plt.show()
     
 
 if __name__ == '__main__':
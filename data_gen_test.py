@@ -0,0 +1,58 @@
+# Checks the closed form of the k-scheme voting power against the loop over weight classes it
+# replaced, run with pytest or as a script
+
+import numpy as np
+
+import src.data_gen as dg
+
+
+MAX_SEATS = 60
+
+
+def get_voting_power_loop(n_seats, k):
+    # the loop get_voting_power used before the closed form, without its assertion
+    vp = np.zeros(n_seats, dtype=int)
+
+    for kk in range(k, 0, -1):
+        if kk == k:
+            idx = [i for i in range(0, int(np.floor(n_seats / kk)))]
+        elif kk == 1:
+            idx = [i for i in range(int(np.ceil(n_seats / 2)), n_seats)]
+        else:
+            low_i = int(np.ceil(n_seats / (kk + 1)))
+            idx = [i for i in range(low_i - 1, int(np.floor(n_seats / kk)))]
+        vp[idx] = kk
+
+    return vp
+
+
+def test_voting_power():
+    for n_seats in range(1, MAX_SEATS + 1):
+        for k in range(1, n_seats + 1):
+            expected = get_voting_power_loop(n_seats, k)
+            # both reject committees where a seat gets no voting power
+            if (expected == 0).any():
+                try:
+                    dg.get_voting_power(n_seats, k)
+                except AssertionError:
+                    continue
+                raise AssertionError('no seat may be left without voting power')
+            assert np.array_equal(dg.get_voting_power(n_seats, k), expected), (n_seats, k)
+
+
+def test_voting_power_batch():
+    for n_seats in range(1, MAX_SEATS + 1):
+        expected = np.array([get_voting_power_loop(n_seats, k) for k in range(1, n_seats + 1)])
+        if (expected == 0).any():
+            continue
+        vp = dg.get_voting_power_batch(n_seats, k_max=n_seats)
+        assert vp.dtype == np.uint8
+        assert np.array_equal(vp, expected), n_seats
+        assert np.array_equal(dg.get_voting_power_batch(n_seats, k_max=n_seats, dtype=int),
+                expected)
+
+
+if __name__ == '__main__':
+    for test in [test_voting_power, test_voting_power_batch]:
+        test()
+        print('{} passed'.format(test.__name__))
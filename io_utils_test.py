@@ -0,0 +1,129 @@
+# Checks the policies for existing output files, the CSV files that interrupted runs resume and
+# the formats of saved tables, run with pytest or as a script
+
+import importlib.util
+import os
+import tempfile
+
+import numpy as np
+
+import src.io_utils as io
+
+
+FIELDNAMES = ['s', 'cost']
+
+
+def test_get_fname():
+    with tempfile.TemporaryDirectory() as tmp:
+        fname = os.path.join(tmp, 'costs.csv')
+        # a new file is written whatever the policy
+        for if_exists in io.IF_EXISTS:
+            assert io.get_fname(fname, if_exists=if_exists) == fname
+
+        for name in ['costs.csv', 'costs_1.csv']:
+            open(os.path.join(tmp, name), 'w').close()
+        assert io.get_fname(fname, if_exists='overwrite') == fname
+        assert io.get_fname(fname, if_exists='rename') == os.path.join(tmp, 'costs_2.csv')
+        assert io.get_fname(fname, if_exists='skip') is None
+        try:
+            io.get_fname(fname, if_exists='fail')
+        except SystemExit:
+            pass
+        else:
+            raise AssertionError('an existing file must stop the run')
+
+
+def test_resume():
+    with tempfile.TemporaryDirectory() as tmp:
+        fname = os.path.join(tmp, 'stop_cost.csv')
+        with io.CsvWriter(fname, FIELDNAMES) as writer:
+            for s in [0.5, 0.6]:
+                writer.write({'s': s, 'cost': 0.1 * s})
+
+        # a run killed while writing leaves a partial row
+        with open(fname, 'a') as f:
+            f.write('0.7,0.0')
+
+        with io.CsvWriter(fname, FIELDNAMES, resume=True) as writer:
+            assert writer.rows == [{'s': 0.5, 'cost': 0.05}, {'s': 0.6, 'cost': 0.06}]
+            writer.write({'s': 0.7, 'cost': 0.07})
+
+        with open(fname) as f:
+            assert f.read() == 's,cost\n0.5,0.05\n0.6,0.06\n0.7,0.07\n'
+
+        # without resume the file is started again
+        with io.CsvWriter(fname, FIELDNAMES) as writer:
+            assert writer.rows == []
+        with open(fname) as f:
+            assert f.read() == 's,cost\n'
+
+
+def test_resume_other_columns():
+    with tempfile.TemporaryDirectory() as tmp:
+        fname = os.path.join(tmp, 'stop_cost.csv')
+        with io.CsvWriter(fname, FIELDNAMES) as writer:
+            writer.write({'s': 0.5, 'cost': 0.05})
+        try:
+            io.CsvWriter(fname, ['s', 'cost', 'gap'], resume=True)
+        except SystemExit:
+            pass
+        else:
+            raise AssertionError('a file with other columns must not be resumed')
+
+        # an empty file, e.g. killed before its header was written, is started again
+        open(fname, 'w').close()
+        with io.CsvWriter(fname, FIELDNAMES, resume=True) as writer:
+            assert writer.rows == []
+            writer.write({'s': 0.5, 'cost': 0.05})
+        with open(fname) as f:
+            assert f.read() == 's,cost\n0.5,0.05\n'
+
+
+def test_tables():
+    rng = np.random.default_rng(1)
+    data = {'s': np.linspace(0.5, 1.5, 11), 'cost for k=1': rng.random(11),
+            'cost for k=2': rng.random(11).astype(np.float32)}
+    formats = [fmt for fmt in io.FORMATS if fmt != 'parquet' or
+            importlib.util.find_spec('pyarrow') is not None or
+            importlib.util.find_spec('fastparquet') is not None]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formats:
+            fname = os.path.join(tmp, 'costs.{}'.format(fmt))
+            io.save_table(fname, data)
+            table = io.load_table(fname)
+            for name, column in data.items():
+                # every format reads back the same numbers, csv as 64-bit floats that equal
+                # the saved ones once cast to their type
+                assert np.array_equal(np.asarray(table[name]).astype(column.dtype), column), \
+                        (fmt, name)
+            if fmt == 'npy':
+                assert isinstance(table, np.memmap)
+                assert table.dtype['cost for k=2'] == np.float32
+            del table
+
+        # columns of npz files may have different lengths
+        fname = os.path.join(tmp, 'grid.npz')
+        io.save_table(fname, {'s': data['s'], 'breakpoints': data['s'][:3]})
+        with io.load_table(fname) as table:
+            assert np.array_equal(table['breakpoints'], data['s'][:3])
+
+
+def test_check_format():
+    for fmt in ['csv', 'npy', 'npz']:
+        io.check_format(fmt)
+    if importlib.util.find_spec('pyarrow') is None and \
+            importlib.util.find_spec('fastparquet') is None:
+        try:
+            io.check_format('parquet')
+        except SystemExit:
+            pass
+        else:
+            raise AssertionError('parquet must be refused without pyarrow or fastparquet')
+
+
+if __name__ == '__main__':
+    for test in [test_get_fname, test_resume, test_resume_other_columns, test_tables,
+            test_check_format]:
+        test()
+        print('{} passed'.format(test.__name__))
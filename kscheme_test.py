@@ -2,7 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
-from src.data_gen import get_voting_power
+from src.data_gen import get_voting_power_batch
 
 M = 10 # number of seats
 K = M  # max value of k
@@ -16,8 +16,7 @@ plt.ylabel('Voting power')
 ax.xaxis.set_major_locator(MaxNLocator(integer=True))
 ax.yaxis.set_major_locator(MaxNLocator(integer=True))
 
-for k in range(1, K + 1):
-    vp = get_voting_power(M, k)
+for k, vp in enumerate(get_voting_power_batch(M, K), start=1):
     plt.plot(R, vp, marker='o', label=f'k={k}')
 
 plt.legend()
@@ -0,0 +1,93 @@
+# Checks the LP files written for the command line MIP solvers and the readers of their solution
+# files, and solves small problems with the solvers that are installed; run with pytest or as a
+# script
+
+import os
+import tempfile
+
+import numpy as np
+
+import src.lp_utils as lu
+
+
+def write_file(tmp, text):
+    fname = os.path.join(tmp, 'model.sol')
+    with open(fname, 'w') as f:
+        f.write(text)
+    return fname
+
+
+def test_write_lp():
+    costs = np.array([0.1, 1 / 3, 2.5e-17])
+    weights = np.array([1, 2, 3])
+    with tempfile.TemporaryDirectory() as tmp:
+        fname = os.path.join(tmp, 'model.lp')
+        lu.write_lp(fname, costs=costs, weights=weights, rhs=4.001)
+        with open(fname) as f:
+            lines = f.read().splitlines()
+
+    assert lines[:3] == ['\\ minimization knapsack', 'Minimize', ' obj:']
+    # costs read back as the same floats
+    assert [float(l.split()[1]) for l in lines[3:6]] == costs.tolist()
+    assert [l.split()[2] for l in lines[3:6]] == ['x1', 'x2', 'x3']
+    assert lines[6:8] == ['Subject To', ' c1:']
+    assert [l.split()[1] for l in lines[8:11]] == ['1', '2', '3']
+    assert lines[11:] == [' >= 4.001', 'Binary', ' x1', ' x2', ' x3', 'End']
+
+
+def test_read_glpk():
+    with tempfile.TemporaryDirectory() as tmp:
+        # plain text format of GLPK 4.57 and later
+        fname = write_file(tmp, 'c Problem:\nc\ns mip 1 3 o 0.4\ni 1 4\nj 1 1\nj 2 0\nj 3 1\n'
+                'e o f\n')
+        status, x = lu._read_glpk(fname, 3)
+        assert status == 'optimal' and x.tolist() == [True, False, True]
+        fname = write_file(tmp, 's mip 1 3 n 0\ni 1 0\nj 1 0\nj 2 0\nj 3 0\ne o f\n')
+        assert lu._read_glpk(fname, 3)[0] == 'infeasible'
+
+        # bare numbers of older versions: rows and columns, status and objective, rows, columns
+        fname = write_file(tmp, '1 3\n5 0.4\n4\n1\n0\n1\n')
+        status, x = lu._read_glpk(fname, 3)
+        assert status == 'optimal' and x.tolist() == [True, False, True]
+        fname = write_file(tmp, '1 3\n4 0\n0\n0\n0\n0\n')
+        assert lu._read_glpk(fname, 3)[0] == 'infeasible'
+
+
+def test_read_cbc():
+    # solution files written by cbc 2.10
+    with tempfile.TemporaryDirectory() as tmp:
+        fname = write_file(tmp, 'Optimal - objective value 0.80000000\n'
+                '      0 x1                     0                     0.1\n'
+                '      1 x2                     1                     0.5\n'
+                '      2 x3                     1                     0.3\n')
+        status, x = lu._read_cbc(fname, 3)
+        assert status == 'optimal' and x.tolist() == [False, True, True]
+        fname = write_file(tmp, 'Infeasible - objective value 1.15000000\n'
+                '      0 x1                     1                   -0.15\n'
+                '**       1 x2                   1.5                       0\n'
+                '      2 x3                     1                   -0.45\n')
+        assert lu._read_cbc(fname, 3)[0] == 'infeasible'
+
+
+def test_run():
+    rng = np.random.default_rng(1)
+    drivers = [d for d in lu.DRIVERS if lu.is_available(d)]
+    for _ in range(20):
+        n_seats = rng.integers(1, 9)
+        costs = rng.random(n_seats)
+        weights = rng.integers(1, 6, size=n_seats)
+        rhs = weights.sum() / 3 + 1e-3
+        # every selection of seats, one per row
+        x = (np.arange(2**n_seats)[:, None] >> np.arange(n_seats) & 1).astype(bool)
+        optimum = (x[x @ weights >= rhs] @ costs).min()
+        for driver in drivers:
+            status, selected = lu.run(driver, costs=costs, weights=weights, rhs=rhs)
+            assert status == 'optimal'
+            assert weights[selected].sum() >= rhs
+            assert np.isclose(costs[selected].sum(), optimum), (driver, costs, weights)
+
+
+if __name__ == '__main__':
+    for test in [test_write_lp, test_read_glpk, test_read_cbc, test_run]:
+        test()
+        print('{} passed'.format(test.__name__))
@@ -1,29 +1,72 @@
 import numpy as np
-import pandas as pd
 
 from src.parsers import main_parser
 import src.data_gen as dg
 import src.graph_utils as gu
 import src.opt_utils as opt
+import src.cache_utils as cu
+import src.timing_utils as tu
 
 
-def main():
-    args = main_parser().parse_args()
+NODE_SIZE = 2000
+
 
+def get_data(args):
+    '''
+    Generates the costs and the voting power of the seats of a scenario
+    Parameters:
+        - args: class 'argparse.Namespace', options of main_parser
+    Returns:
+        - array of floats, costs of seats
+        - array of numbers, voting power of seats
+    '''
     np.random.seed(seed=args.seed)
 
-    N_SEATS = args.n_seats
-    ALPHA = 1.0 / 3 if args.mode == 'stop' else 2.0 / 3
-    NODE_SIZE = 2000
-    
     if args.data == 'random':
-        COSTS = np.random.uniform(low=0, high=1, size=N_SEATS)
-        WEIGHTS = np.random.randint(low=1, high=args.max_weight + 1, size=N_SEATS)
+        costs = np.random.uniform(low=0, high=1, size=args.n_seats)
+        weights = np.random.randint(low=1, high=args.max_weight + 1, size=args.n_seats)
+    elif args.data == 'stake':
+        # stakes spread over orders of magnitude, as in proof-of-stake networks
+        costs = np.random.uniform(low=0, high=1, size=args.n_seats)
+        weights = 1e3 * (np.random.pareto(a=1.16, size=args.n_seats) + 1)
     else:
-        COSTS = dg.get_costs(n_nodes=args.n_nodes, zipf_coeffs=args.zipfc)[:N_SEATS]
-        WEIGHTS = dg.get_voting_power(n_nodes=args.n_nodes)[:N_SEATS]
+        costs = dg.get_costs(n_nodes=args.n_nodes, zipf_coeffs=args.zipfc)[:args.n_seats]
+        weights = dg.get_voting_power(n_seats=args.n_seats, k=args.k)
+
+    return costs, weights
+
+
+def solve(args, costs, weights, cache=None):
+    '''
+    Finds the cheapest seats an attacker has to select in a scenario
+    Parameters:
+        - args: class 'argparse.Namespace', options of main_parser
+        - costs: array of floats, costs of seats
+        - weights: array of numbers, voting power of seats
+        - cache: SolveCache or None, cache of solved problems
+    Returns:
+        - see opt_utils.optimize
+    '''
+    alpha = 1.0 / 3 if args.mode == 'stop' else 2.0 / 3
+
+    return opt.optimize(n_seats=args.n_seats, alpha=alpha, costs=costs, weights=weights,
+            mode=args.mode, solver_name=args.solver, verbose=args.verbose, cache=cache,
+            epsilon=args.epsilon)
+
+
+def main():
+    args = main_parser().parse_args()
+    if args.timing:
+        tu.stats.enable()
+
+    N_SEATS = args.n_seats
+    ALPHA = 1.0 / 3 if args.mode == 'stop' else 2.0 / 3
+
+    COSTS, WEIGHTS = get_data(args)
+    # plots are drawn only to be shown, --save_fig renders its image without pyplot
+    show_plots = not args.novis and not args.hide_plots
     
-    if not args.novis:
+    if show_plots:
         H, W, nodes_pos = gu.layout(n_seats=N_SEATS, node_size=NODE_SIZE)
         gu.plot(
                 n_seats=N_SEATS,
@@ -36,15 +79,24 @@ def main():
                 fig_h=H,
                 solved=False,
                 latex=args.latex,
-                show=not args.hide_plots,
+                label_limit=args.label_limit,
                 )
     
-    model = opt.get_model(n_seats=N_SEATS, alpha=ALPHA, costs=COSTS, weights=WEIGHTS, mode=args.mode)
+    try:
+        instance, min_voting_power, adversary_voting_power, adversary_cost, selected_seats, \
+                colors = solve(args=args, costs=COSTS, weights=WEIGHTS,
+                        cache=cu.get_cache(cache_dir=args.cache_dir, cache_size=args.cache_size))
+    except ValueError as e:
+        # e.g. fractional voting power given to a solver that needs integers
+        print(e)
+        exit()
 
-    instance, min_voting_power, adversary_voting_power, adversary_cost, selected_seats, colors =\
-            opt.solve(model=model, solver_name=args.solver, verbose=args.verbose)
+    if tu.stats.enabled:
+        tu.stats.report()
+        if args.timing:
+            tu.stats.save(args.timing)
 
-    if not args.novis:
+    if show_plots:
         gu.plot(
                 n_seats=N_SEATS,
                 mode=args.mode,
@@ -60,15 +112,41 @@ def main():
                 adversary_cost=adversary_cost,
                 colors=colors,
                 latex=args.latex,
-                show=not args.hide_plots,
+                label_limit=args.label_limit,
+                )
+    
+    if args.save_fig is not None:
+        gu.render(
+                fname=args.save_fig,
+                n_seats=N_SEATS,
+                mode=args.mode,
+                costs=COSTS,
+                weights=WEIGHTS,
+                node_size=NODE_SIZE,
+                solved=True,
+                min_voting_power=min_voting_power,
+                adversary_voting_power=adversary_voting_power,
+                adversary_cost=adversary_cost,
+                colors=colors,
+                latex=args.latex,
+                label_limit=args.label_limit,
                 )
     
     if args.verbose:
+        import pandas as pd
+
         df = pd.DataFrame()
         df['seat'] = pd.Series(range(1, N_SEATS + 1))
         df['cost'] = pd.Series(COSTS)
         df['weight'] = pd.Series(WEIGHTS)
-        df['selected'] = pd.Series(instance.x.get_values().values()).astype(bool)
+        df['selected'] = df['seat'].isin(selected_seats)
+        if np.all(np.mod(WEIGHTS, 1) == 0):
+            # minimum attacker cost if the seat is forced into or out of the selection
+            try:
+                df['forced_in'], df['forced_out'] = opt.get_sensitivity(alpha=ALPHA,
+                        costs=COSTS, weights=WEIGHTS, mode=args.mode)
+            except ValueError as e:
+                print(e)
         print(df)
         print()
 
@@ -78,6 +156,20 @@ def main():
         print('Seats to be selected:', selected_seats)
         print('Obtained voting power: {}'.format(adversary_voting_power))
 
+    if args.top_k is not None and not np.all(np.mod(WEIGHTS, 1) == 0):
+        print('The cheapest sets of seats can be listed for integer voting power only')
+    elif args.top_k is not None:
+        try:
+            solutions = opt.get_top_solutions(alpha=ALPHA, costs=COSTS, weights=WEIGHTS,
+                    mode=args.mode, top_k=args.top_k)
+        except ValueError as e:
+            print(e)
+            exit()
+        print('The {} cheapest sets of seats to {} the committee:'.format(len(solutions),
+            args.mode))
+        for rank, (cost, power, seats) in enumerate(solutions, start=1):
+            print('{:>4}. cost {:.6f}, voting power {}, seats {}'.format(rank, cost, power, seats))
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,80 @@
+# Calculates the distribution of attacker cost over random committees
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+
+from src.parsers import monte_carlo_parser
+import src.data_gen as dg
+import src.io_utils as io
+import src.opt_utils as opt
+
+
+def solve_batch(args, seed_seq, n_committees):
+    '''
+    Draws a batch of random committees from its own random stream and solves them at once
+    '''
+    costs, weights = dg.get_random_committees(seed_seq=seed_seq, n_committees=n_committees,
+            n_seats=args.n_seats, max_weight=args.max_weight)
+    alpha = 1.0 / 3 if args.mode == 'stop' else 2.0 / 3
+
+    return opt.get_attacker_costs_batch(alpha=alpha, costs=costs, weights=weights,
+            mode=args.mode)
+
+
+def main():
+    args = monte_carlo_parser().parse_args()
+    fname = None
+    if args.csv:
+        io.check_format(args.format)
+        fname = io.get_fname('{}_cost_mc.{}'.format(args.mode, args.format),
+                if_exists=args.if_exists)
+
+    # every batch gets a child stream of the seed, so the samples do not depend on the number of
+    # workers nor on the order the batches are solved in
+    sizes = [min(args.batch_size, args.samples - start)
+            for start in range(0, args.samples, args.batch_size)]
+    seeds = np.random.SeedSequence(args.seed).spawn(len(sizes))
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        mapper = pool.map if args.workers > 1 else map
+        attacker_costs = np.concatenate(list(mapper(solve_batch, repeat(args), seeds, sizes)))
+
+    quantiles = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+    print('Attacker cost to {} a committee of {} seats over {} random committees:'.format(
+        args.mode, args.n_seats, args.samples))
+    print('mean {:.6f}, standard deviation {:.6f}, min {:.6f}, max {:.6f}'.format(
+        attacker_costs.mean(), attacker_costs.std(), attacker_costs.min(), attacker_costs.max()))
+    for q, v in zip(quantiles, np.quantile(attacker_costs, quantiles)):
+        print('{:>4.0%} quantile {:.6f}'.format(q, v))
+
+    if fname is not None:
+        io.save_table(fname=fname, data={'sample': np.arange(1, args.samples + 1),
+            'cost': attacker_costs})
+        print('Data saved in {}'.format(fname))
+
+    if args.hide_plots:
+        return
+
+    import matplotlib.pyplot as plt
+
+    if args.latex:
+        plt.rcParams['font.size'] = 11
+        plt.rcParams['font.family'] = 'serif'
+        plt.rcParams['font.serif'] = ['Times New Roman'] + plt.rcParams['font.serif']
+        plt.rc('text', usetex=True)
+
+    title = 'Distribution of minimum attacker cost to {} random committees'.format(args.mode)
+    if args.latex:
+        title = r'{\bf %s}' % title
+    plt.title(label=title, fontweight='bold')
+
+    plt.hist(attacker_costs, bins=args.bins)
+    plt.xlabel('Attacker cost')
+    plt.ylabel('Number of committees')
+
+    plt.show()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+
+class SolveCache:
+    ''' On-disk cache of solved problems, keyed by a hash of the problem data and the solver.
+    Every entry is a small JSON file storing the attacker cost and the selected seats. Hits
+    refresh the modification time of the entry, and once the total size of the cache exceeds
+    max_size bytes, the least recently used entries are removed until it is below low_water times
+    max_size, so that a full cache is not scanned again at every put.
+    '''
+    def __init__(self, cache_dir, max_size=100 * 2**20, low_water=0.8):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.low_water = low_water
+        self.size = 0
+        self.evict()
+
+    def _entries(self):
+        return [e for e in os.scandir(self.cache_dir) if e.name.endswith('.json')]
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.json')
+
+    @staticmethod
+    def key(costs, weights, alpha, mode, solver_name):
+        '''
+        Computes the key of a problem
+        Parameters:
+            - costs: array of floats, costs of seats
+            - weights: array of numbers, voting power of seats
+            - alpha: float, fraction of the total voting power
+            - mode: str, either stop or overtake
+            - solver_name: str, solver name
+        Returns:
+            - str, hexadecimal SHA-256 digest
+        '''
+        h = hashlib.sha256()
+        h.update(np.ascontiguousarray(costs, dtype=np.float64).tobytes())
+        h.update(np.ascontiguousarray(weights, dtype=np.float64).tobytes())
+        h.update('{!r}|{}|{}'.format(float(alpha), mode, solver_name).encode())
+        return h.hexdigest()
+
+    def get(self, key):
+        '''
+        Returns the tuple (attacker_cost, selected_seats) stored under key, or None if missing
+        '''
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # missing, evicted by another process or partially written by a killed one
+            return None
+        return entry['attacker_cost'], entry['selected_seats']
+
+    def put(self, key, attacker_cost, selected_seats):
+        '''
+        Stores the solution of a problem under key and evicts old entries if needed
+        '''
+        entry = {'attacker_cost': float(attacker_cost),
+                'selected_seats': [int(s) for s in selected_seats]}
+
+        # write to a temporary file first so that readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entry, f)
+        # an entry written again, e.g. by another process, replaces the old one
+        try:
+            self.size -= os.path.getsize(self._path(key))
+        except FileNotFoundError:
+            pass
+        self.size += os.path.getsize(tmp)
+        os.replace(tmp, self._path(key))
+
+        if self.size > self.max_size:
+            self.evict(max_size=int(self.low_water * self.max_size))
+
+    def evict(self, max_size=None):
+        '''
+        Removes the least recently used entries until the cache fits in max_size, by default the
+        maximum size of the cache
+        '''
+        max_size = self.max_size if max_size is None else max_size
+        entries = []
+        for e in self._entries():
+            try:
+                stat = e.stat()
+            except FileNotFoundError:
+                continue
+            entries += [(stat.st_mtime, stat.st_size, e.path)]
+        entries.sort()
+        self.size = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if self.size <= max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.size -= size
+
+
+def get_cache(cache_dir, cache_size):
+    '''
+    Creates the cache requested on the command line
+    Parameters:
+        - cache_dir: str or None, cache directory, None disables the cache
+        - cache_size: float, maximum size of the cache in MB
+    Returns:
+        - SolveCache or None
+    '''
+    if cache_dir is None:
+        return None
+    return SolveCache(cache_dir=cache_dir, max_size=int(cache_size * 2**20))
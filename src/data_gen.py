@@ -1,12 +1,37 @@
 import numpy as np
 
 
-def get_costs(n_nodes, zipf_coeffs):
-    zipf_coeffs = zipf_coeffs * np.ones(n_nodes) if np.isscalar(zipf_coeffs) else zipf_coeffs
+def get_costs(n_nodes, zipf_coeffs, dtype=np.float64):
+    zipf_coeffs = np.asarray(zipf_coeffs, dtype=np.float64)
 
-    costs = np.array([1.0 / np.power(i+1, s) for i, s in enumerate(zipf_coeffs)])
+    costs = 1.0 / np.power(np.arange(1, n_nodes + 1, dtype=np.float64), zipf_coeffs)
     
-    return costs / costs.sum()
+    return (costs / costs.sum()).astype(dtype, copy=False)
+
+
+def get_costs_batch(n_nodes, zipf_coeffs, n_seats=None, dtype=np.float64):
+    '''
+    Computes costs of nodes for many Zipf coefficients at once
+    Parameters:
+        - n_nodes: int, number of nodes in the network
+        - zipf_coeffs: array of floats, Zipf coefficients
+        - n_seats: int, number of leading nodes to return (costs are still normalized over all
+          nodes), defaults to None, i.e. all nodes
+        - dtype: dtype of the result, e.g. np.float32 to halve memory, defaults to np.float64
+    Returns:
+        - 2-D array of shape (len(zipf_coeffs), n_seats), one row of costs per coefficient
+    '''
+    zipf_coeffs = np.atleast_1d(np.asarray(zipf_coeffs, dtype=np.float64))
+    n_seats = n_nodes if n_seats is None else n_seats
+    ranks = np.arange(1, n_nodes + 1, dtype=np.float64)
+
+    costs = np.empty((len(zipf_coeffs), n_seats), dtype=dtype)
+    # rows are filled one by one so that temporaries take O(n_nodes) memory
+    for row, s in zip(costs, zipf_coeffs):
+        c = 1.0 / np.power(ranks, s)
+        row[:] = c[:n_seats] / c.sum()
+
+    return costs
 
 
 def _get_voting_power(n_nodes, k):
@@ -38,30 +63,67 @@ def _get_voting_power(n_nodes, k):
     assert (vp > 0).all()
     return vp
 
-def get_voting_power(n_seats, k):
-    vp = np.zeros(n_seats, dtype=int)
+def _voting_power_rows(n_seats, ks, out):
+    # the rank i (0-based) gets the smallest kk whose block in the k-scheme contains it:
+    # - kk = 1 covers ranks from ceil(n_seats/2) on (if k > 1),
+    # - 1 < kk < k covers ranks from ceil(n_seats/(kk+1)) - 1 to floor(n_seats/kk) - 1,
+    #   i.e. rank i is covered by kk from ceil(n_seats/(i+1)) - 1 to floor(n_seats/(i+1)),
+    # - kk = k covers ranks below floor(n_seats/k), i.e. those with k <= floor(n_seats/(i+1))
+    i = np.arange(n_seats, dtype=np.int64)
+    q = n_seats // (i + 1)
+    middle = np.maximum(-(-n_seats // (i + 1)) - 1, 2)
+    middle_ok = middle <= q
+    bottom = i >= -(-n_seats // 2)
 
-    for kk in range(k, 0, -1):
-        if kk == k:
-            low_i = 0 # inclusive
-            up_i = n_seats / kk  # inclusive
-            up_i = int(np.floor(up_i))
-            # print('kk={}, low_i={}, up_i={}'.format(kk, low_i, up_i))
-            idx = [i for i in range(low_i, up_i)]
-        elif kk == 1:
-            low_i = n_seats / 2   # exclusive
-            low_i = int(np.ceil(low_i))
-            up_i = n_seats
-            # print('kk={}, low_i={}, up_i={}'.format(kk, low_i, up_i))
-            idx = [i for i in range(low_i, up_i)]
-        else:
-            low_i = n_seats / (kk + 1)  # exclusive
-            low_i = int(np.ceil(low_i))
-            up_i = n_seats / kk # inclusive
-            up_i = int(np.floor(up_i))
-            # print('kk={}, low_i={}, up_i={}'.format(kk, low_i, up_i))
-            idx = [i for i in range(low_i-1, up_i)]
-        vp[idx] = kk
+    for row, k in zip(out, ks):
+        row[:] = np.where(k <= q, k, 0)
+        row[middle_ok & (middle < k)] = middle[middle_ok & (middle < k)]
+        if k > 1:
+            row[bottom] = 1
+
+    return out
+
+
+def get_voting_power(n_seats, k, dtype=int):
+    vp = _voting_power_rows(n_seats, [k], np.empty((1, n_seats), dtype=dtype))[0]
     
     assert (vp > 0).all()
     return vp
+
+
+def get_voting_power_batch(n_seats, k_max, dtype=None):
+    '''
+    Computes voting power of seats in the k-scheme for all k from 1 to k_max at once
+    Parameters:
+        - n_seats: int, number of seats in the committee
+        - k_max: int, maximum value of k
+        - dtype: dtype of the result, defaults to the smallest unsigned integer type holding k_max
+    Returns:
+        - 2-D array of shape (k_max, n_seats), row k-1 is get_voting_power(n_seats, k)
+    '''
+    dtype = np.min_scalar_type(k_max) if dtype is None else dtype
+    vp = _voting_power_rows(n_seats, range(1, k_max + 1), np.empty((k_max, n_seats), dtype=dtype))
+
+    assert (vp > 0).all()
+    return vp
+
+
+def get_random_committees(seed_seq, n_committees, n_seats, max_weight):
+    '''
+    Draws random committees as the random data of main.py: costs uniform in [0, 1) and voting
+    power uniform in {1, ..., max_weight}
+    Parameters:
+        - seed_seq: numpy.random.SeedSequence, seed of the random stream of the committees
+        - n_committees: int, number of committees
+        - n_seats: int, number of seats in every committee
+        - max_weight: int, maximum value of voting power
+    Returns:
+        - 2-D array of floats of shape (n_committees, n_seats), costs of seats
+        - 2-D array of integers of shape (n_committees, n_seats), voting power of seats
+    '''
+    rng = np.random.default_rng(seed_seq)
+    costs = rng.uniform(low=0, high=1, size=(n_committees, n_seats))
+    weights = rng.integers(low=1, high=max_weight + 1, size=(n_committees, n_seats),
+            dtype=np.min_scalar_type(max_weight))
+
+    return costs, weights
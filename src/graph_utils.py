@@ -1,59 +1,42 @@
 import numpy as np
-import networkx as nx
-import matplotlib.pyplot as plt
 
 
 def layout(n_seats, node_size):
     # position of nodes, height and width of the figure
-    n_rows = int(np.floor(np.sqrt(n_seats)))
-    n_cols = int(np.floor(n_seats/n_rows))
+    H, W, pos = layout_array(n_seats=n_seats, node_size=node_size)
+    pos = dict(zip(range(1, n_seats + 1), pos.tolist()))
+
+    return H, W, pos
 
-    remain = n_seats - n_rows * n_cols
-    n_cols = n_cols + 1 if remain else n_cols
+
+def layout_array(n_seats, node_size):
+    '''
+    Places the seats on a grid of rows, as layout does, without Python loops
+    Parameters:
+        - n_seats: int, number of seats in the committee
+        - node_size: float, size of a node
+    Returns:
+        - float, height of the figure
+        - float, width of the figure
+        - array of shape (n_seats, 2), positions of seats
+    '''
+    n_rows = int(np.floor(np.sqrt(n_seats)))
+    n_cols = int(np.ceil(n_seats / n_rows))
 
     H = (3 * n_rows + 1) * node_size / 2
     W = (3 * n_cols + 1) * node_size / 2
 
-    pos = []
-
-    for row in range(n_rows):
-        y = (1 + 3 * row / 2) * node_size
-        for col in range(n_cols):
-            x = (1 + 3 * col / 2) * node_size
-            pos += [[x, y]]
-            if row == n_rows - 1 and len(pos) == n_seats:
-                break
-    pos = dict(zip(range(1, n_seats + 1), pos))
-    
-    return H, W, pos
-
+    row, col = np.divmod(np.arange(n_seats), n_cols)
+    pos = np.column_stack(((1 + 3 * col / 2) * node_size, (1 + 3 * row / 2) * node_size))
 
-def plot(n_seats, mode, costs, weights, nodes_pos, node_size, fig_w, fig_h,
-        solved=False, min_voting_power=None,
-        adversary_voting_power=None, adversary_cost=None, colors=None, latex=False, show=True):
-    if latex:
-        plt.rcParams['font.size'] = 11
-        plt.rcParams['font.family'] = 'serif'
-        plt.rcParams['font.serif'] = ['Times New Roman'] + plt.rcParams['font.serif']
-        plt.rc('text', usetex=True)
+    return H, W, pos
 
-    G = nx.Graph()
-    labels = {}
-
-    for seat in range(1, n_seats + 1):
-        if latex:
-            seat_ = r'{\bf %d}' % seat
-            c = r'$C=%.2f$' % costs[seat-1]
-            v = r'$V=%d$' % weights[seat-1]
-        else:
-            seat_ = seat
-            c = 'C={:.2f}'.format(costs[seat-1])
-            v = 'V={}'.format(weights[seat-1])
-        label = '{}\n{}\n{}'.format(seat_, c, v)
-        labels[seat] = label
-        G.add_node(seat)
 
-    _, ax = plt.subplots()
+def _draw(ax, n_seats, mode, costs, weights, nodes_pos, marker_size, fig_w, fig_h, solved,
+        min_voting_power, adversary_voting_power, adversary_cost, colors, latex, label_limit):
+    # draws the committee with a single scatter, seats are labelled up to label_limit seats
+    if isinstance(nodes_pos, dict):
+        nodes_pos = np.array(list(nodes_pos.values()))
 
     title = 'Committee with {} seats'.format(n_seats)
     if solved:
@@ -64,10 +47,10 @@ def plot(n_seats, mode, costs, weights, nodes_pos, node_size, fig_w, fig_h,
         assert colors is not None
     if latex:
         title = r'{\bf %s}' % title
-    plt.title(label=title, fontweight='bold', fontsize=14 if latex else 11)
+    ax.set_title(label=title, fontweight='bold', fontsize=14 if latex else 11)
 
-    plt.xlim([0, fig_w])
-    plt.ylim([0, fig_h])
+    ax.set_xlim([0, fig_w])
+    ax.set_ylim([0, fig_h])
 
     if latex:
         c_label = r'$C$---cost'
@@ -84,29 +67,100 @@ def plot(n_seats, mode, costs, weights, nodes_pos, node_size, fig_w, fig_h,
             advV_label = 'advV={}'.format(adversary_voting_power)
             advC_label = 'advC={:.2f}'.format(adversary_cost)
 
+    labelled = label_limit is None or n_seats <= label_limit
+
     if solved:
-        plt.plot(-np.inf, -np.inf, linestyle='', marker='o', color='green', label='Selected by attacker')
-    plt.plot(-1, -1, linestyle='', color='white', label=c_label)
-    plt.plot(-1, -1, linestyle='', color='white', label=v_label)
+        ax.plot(-np.inf, -np.inf, linestyle='', marker='o', color='green', label='Selected by attacker')
+    if labelled:
+        ax.plot(-1, -1, linestyle='', color='white', label=c_label)
+        ax.plot(-1, -1, linestyle='', color='white', label=v_label)
     if solved:
-        plt.plot(-1, -1, linestyle='', color='white', label=minV_label)
-        plt.plot(-1, -1, linestyle='', color='white', label=advV_label)
-        plt.plot(-1, -1, linestyle='', color='white', label=advC_label)
-
-    nx.draw(
-            G=G,
-            pos=nodes_pos,
-            ax=ax,
-            with_labels=True,
-            labels=labels,
-            node_size=node_size,
-            node_color='orange' if colors is None else colors,
-            font_size=11 if latex else 10,
-            )
+        ax.plot(-1, -1, linestyle='', color='white', label=minV_label)
+        ax.plot(-1, -1, linestyle='', color='white', label=advV_label)
+        ax.plot(-1, -1, linestyle='', color='white', label=advC_label)
+
+    ax.scatter(nodes_pos[:, 0], nodes_pos[:, 1], s=marker_size,
+            c='orange' if colors is None else colors, linewidths=0)
+
+    if labelled:
+        for seat, (x, y) in enumerate(nodes_pos, start=1):
+            if latex:
+                seat_ = r'{\bf %d}' % seat
+                c = r'$C=%.2f$' % costs[seat-1]
+                v = r'$V=%d$' % weights[seat-1]
+            else:
+                seat_ = seat
+                c = 'C={:.2f}'.format(costs[seat-1])
+                v = 'V={}'.format(weights[seat-1])
+            ax.text(x, y, '{}\n{}\n{}'.format(seat_, c, v), ha='center', va='center',
+                    fontsize=11 if latex else 10)
+
+    ax.set_axis_off()
     if solved:
-        plt.legend()
-    else:
-        plt.legend(handlelength=0)
+        ax.legend()
+    elif labelled:
+        ax.legend(handlelength=0)
+
+
+def plot(n_seats, mode, costs, weights, nodes_pos, node_size, fig_w, fig_h,
+        solved=False, min_voting_power=None,
+        adversary_voting_power=None, adversary_cost=None, colors=None, latex=False, show=True,
+        label_limit=None):
+    import matplotlib.pyplot as plt
+
+    if latex:
+        plt.rcParams['font.size'] = 11
+        plt.rcParams['font.family'] = 'serif'
+        plt.rcParams['font.serif'] = ['Times New Roman'] + plt.rcParams['font.serif']
+        plt.rc('text', usetex=True)
+
+    _, ax = plt.subplots()
+
+    _draw(ax=ax, n_seats=n_seats, mode=mode, costs=costs, weights=weights, nodes_pos=nodes_pos,
+            marker_size=node_size, fig_w=fig_w, fig_h=fig_h, solved=solved,
+            min_voting_power=min_voting_power, adversary_voting_power=adversary_voting_power,
+            adversary_cost=adversary_cost, colors=colors, latex=latex, label_limit=label_limit)
 
     if show:
         plt.show()
+
+
+def render(fname, n_seats, mode, costs, weights, node_size=2000, solved=False,
+        min_voting_power=None, adversary_voting_power=None, adversary_cost=None, colors=None,
+        latex=False, label_limit=100, fig_size=10, dpi=150):
+    '''
+    Draws the committee straight to an image file without pyplot, so it runs on headless servers
+    and scales to large committees: the layout is vectorised, seats are drawn with a single
+    scatter and labelled only for committees of at most label_limit seats
+    Parameters:
+        - fname: str, name of the image file, its extension (e.g. png or svg) sets the format
+        - n_seats, mode, costs, weights, node_size, solved, min_voting_power,
+          adversary_voting_power, adversary_cost, colors, latex: see plot
+        - label_limit: int, largest committee whose seats are labelled, None labels all seats
+        - fig_size: float, size of the longer side of the figure in inches
+        - dpi: int, resolution of raster images
+    '''
+    # a bare figure does not need pyplot nor a GUI backend
+    import matplotlib
+    from matplotlib.figure import Figure
+
+    H, W, nodes_pos = layout_array(n_seats=n_seats, node_size=node_size)
+
+    labelled = label_limit is None or n_seats <= label_limit
+    if labelled:
+        # labels need as much room as plot gives them
+        fig_size = max(fig_size, 1.5 * np.sqrt(n_seats))
+    fig = Figure(figsize=(fig_size * W / max(H, W), fig_size * H / max(H, W)))
+    ax = fig.add_axes([0, 0, 1, 0.95])
+
+    # a seat takes 2/3 of its cell of the grid, marker sizes are in squared points
+    marker_size = (72 * fig_size / max(H, W) * node_size) ** 2
+
+    with matplotlib.rc_context({'text.usetex': latex, 'font.family': 'serif'} if latex else {}):
+        _draw(ax=ax, n_seats=n_seats, mode=mode, costs=costs, weights=weights,
+                nodes_pos=nodes_pos, marker_size=marker_size, fig_w=W, fig_h=H, solved=solved,
+                min_voting_power=min_voting_power, adversary_voting_power=adversary_voting_power,
+                adversary_cost=adversary_cost, colors=colors, latex=latex,
+                label_limit=label_limit)
+        fig.savefig(fname, dpi=dpi)
+    print('Figure saved in {}'.format(fname))
@@ -0,0 +1,164 @@
+import csv
+import importlib.util
+import os
+import sys
+
+import numpy as np
+
+
+# what to do with an output file that already exists
+IF_EXISTS = ['fail', 'overwrite', 'rename', 'skip']
+
+
+def get_fname(fname, if_exists):
+    '''
+    Applies the policy for existing output files without asking, so unattended runs never hang;
+    scripts call it before solving anything, so a run fails early rather than after its solves
+    Parameters:
+        - fname: str, name of the output file
+        - if_exists: str, one of IF_EXISTS: fail exits, overwrite keeps fname, rename picks the
+          first free name fname_1, fname_2, ... and skip does not save data
+    Returns:
+        - str or None, name of the file to write, None if data must not be saved
+    '''
+    if not os.path.isfile(fname) or if_exists == 'overwrite':
+        return fname
+
+    if if_exists == 'rename':
+        root, ext = os.path.splitext(fname)
+        i = 1
+        while os.path.isfile('{}_{}{}'.format(root, i, ext)):
+            i += 1
+        new_fname = '{}_{}{}'.format(root, i, ext)
+        print('File {} exists, data will be saved in {}'.format(fname, new_fname))
+        return new_fname
+    elif if_exists == 'skip':
+        print('File {} exists, data will not be saved'.format(fname))
+        return None
+
+    sys.exit('File {} exists, pass --if_exists to overwrite, rename or skip it'.format(fname))
+
+
+# formats of saved tables, given by the extension of the file
+FORMATS = ['csv', 'npy', 'npz', 'parquet']
+
+
+def check_format(fmt):
+    '''
+    Exits early if the format needs an optional dependency that is not installed
+    '''
+    if fmt == 'parquet' and importlib.util.find_spec('pyarrow') is None and \
+            importlib.util.find_spec('fastparquet') is None:
+        sys.exit('Parquet files need pyarrow or fastparquet, install one of them')
+
+
+def save_table(fname, data):
+    '''
+    Saves columns of numbers in the format given by the extension of the file name: csv, npy (a
+    structured array, memory-mapped by load_table), npz (one array per column, columns may have
+    different lengths) or parquet (needs pyarrow or fastparquet)
+    Parameters:
+        - fname: str, name of the file
+        - data: dict, name and array of every column
+    '''
+    fmt = os.path.splitext(fname)[1][1:].lower()
+
+    if fmt == 'npy':
+        columns = {name: np.asarray(column) for name, column in data.items()}
+        table = np.empty(len(next(iter(columns.values()))),
+                dtype=[(name, column.dtype) for name, column in columns.items()])
+        for name, column in columns.items():
+            table[name] = column
+        np.save(fname, table)
+    elif fmt == 'npz':
+        np.savez(fname, **data)
+    else:
+        import pandas as pd
+
+        df = pd.DataFrame(data)
+        if fmt == 'parquet':
+            df.to_parquet(fname, index=False)
+        else:
+            df.to_csv(fname, index=False)
+
+
+def load_table(fname):
+    '''
+    Reads a table saved by save_table. Tables in npy files are memory-mapped, so they are not read
+    into memory and only the rows used are read from disk; arrays in npz files are read when first
+    accessed
+    Parameters:
+        - fname: str, name of the file
+    Returns:
+        - table whose columns are indexed by name: structured memmap for npy, NpzFile for npz,
+          pandas.DataFrame for csv and parquet
+    '''
+    fmt = os.path.splitext(fname)[1][1:].lower()
+
+    if fmt == 'npy':
+        return np.load(fname, mmap_mode='r')
+    elif fmt == 'npz':
+        return np.load(fname)
+
+    import pandas as pd
+
+    if fmt == 'parquet':
+        return pd.read_parquet(fname)
+    # the default parser of pandas may be off by one unit in the last place
+    return pd.read_csv(fname, float_precision='round_trip')
+
+
+def _truncate_partial_row(fname):
+    # a run killed while writing leaves a row without its line break, drop it
+    with open(fname, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+
+
+class CsvWriter:
+    ''' Appends rows of numbers to a CSV file as they are computed. Every row is flushed and
+    synced to disk, so an interrupted run loses at most the row it was writing. When resuming,
+    the rows already in the file are read into rows and new rows are appended after them.
+    '''
+    def __init__(self, fname, fieldnames, resume=False):
+        self.fname = fname
+        self.rows = []
+
+        if resume and os.path.isfile(fname):
+            _truncate_partial_row(fname)
+            with open(fname, newline='') as f:
+                reader = csv.DictReader(f)
+                if reader.fieldnames is not None and reader.fieldnames != fieldnames:
+                    sys.exit('Cannot resume {}: its columns {} differ from {}'.format(fname,
+                        reader.fieldnames, fieldnames))
+                self.rows = [{key: float(value) for key, value in row.items()} for row in reader]
+                # an empty file, e.g. of a run killed before its header was written, has no
+                # header to read
+                resume = reader.fieldnames is not None
+        else:
+            resume = False
+
+        self.f = open(fname, 'a' if resume else 'w', newline='')
+        self.writer = csv.DictWriter(self.f, fieldnames=fieldnames)
+        if not resume:
+            self.writer.writeheader()
+            self._sync()
+
+    def _sync(self):
+        self.f.flush()
+        os.fsync(self.f.fileno())
+
+    def write(self, row):
+        # str of a float reads back as the same float
+        self.writer.writerow({key: float(value) for key, value in row.items()})
+        self._sync()
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
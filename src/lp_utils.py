@@ -0,0 +1,121 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+
+import src.timing_utils as tu
+
+
+def write_lp(fname, costs, weights, rhs):
+    '''
+    Writes the minimization knapsack problem in CPLEX LP format straight from the arrays, with
+    one term per line so that no line gets too long for the LP readers of the solvers
+    Parameters:
+        - fname: str, name of the LP file
+        - costs: array of floats, costs of seats
+        - weights: array of numbers, voting power of seats
+        - rhs: float, right-hand side of the constraint
+    '''
+    names = ['x{}'.format(i) for i in range(1, len(costs) + 1)]
+
+    with open(fname, 'w') as f:
+        f.write('\\ minimization knapsack\nMinimize\n obj:\n')
+        # repr gives the shortest string that reads back as the same float
+        f.writelines(' + {!r} {}\n'.format(c, x) for c, x in zip(costs.tolist(), names))
+        f.write('Subject To\n c1:\n')
+        f.writelines(' + {!r} {}\n'.format(w, x) for w, x in zip(weights.tolist(), names))
+        f.write(' >= {!r}\nBinary\n'.format(float(rhs)))
+        f.writelines(' {}\n'.format(x) for x in names)
+        f.write('End\n')
+
+
+def _read_glpk(fname, n):
+    # GLPK 4.57 and later write the solution in the plain text format of glp_write_mip, which
+    # tags lines with their kind; older versions write bare numbers in a fixed order
+    with open(fname) as f:
+        lines = [l.split() for l in f if l.strip()]
+
+    x = np.zeros(n)
+    if lines[0][0] in ('c', 's'):
+        status = 'other'
+        for l in lines:
+            if l[0] == 's':
+                status = {'o': 'optimal', 'n': 'infeasible'}.get(l[4], 'other')
+            elif l[0] == 'j':
+                x[int(l[1]) - 1] = float(l[2])
+    else:
+        m = int(lines[0][0])
+        # GLP_OPT and GLP_NOFEAS
+        status = {5: 'optimal', 4: 'infeasible'}.get(int(lines[1][0]), 'other')
+        x[:] = [float(l[0]) for l in lines[2 + m:2 + m + n]]
+
+    return status, x > 0.5
+
+
+def _read_cbc(fname, n):
+    # the first line holds the status, the next ones the index, name and value of the non-zero
+    # columns
+    with open(fname) as f:
+        lines = f.readlines()
+
+    if lines[0].startswith('Optimal'):
+        status = 'optimal'
+    elif 'infeasible' in lines[0].lower():
+        status = 'infeasible'
+    else:
+        status = 'other'
+
+    x = np.zeros(n)
+    for l in lines[1:]:
+        l = l.replace('**', '').split()
+        if len(l) >= 3 and l[1].startswith('x'):
+            x[int(l[1][1:]) - 1] = float(l[2])
+
+    return status, x > 0.5
+
+
+# command line MIP solvers: executable, arguments given the LP and solution files, and reader of
+# the solution file
+DRIVERS = {
+        'glpk': ('glpsol', lambda lp, sol: ['--lp', lp, '--write', sol], _read_glpk),
+        'cbc': ('cbc', lambda lp, sol: [lp, '-solve', '-solution', sol], _read_cbc),
+        }
+
+
+def is_available(driver):
+    return shutil.which(DRIVERS[driver][0]) is not None
+
+
+def run(driver, costs, weights, rhs, verbose=False):
+    '''
+    Solves the minimization knapsack problem with a command line MIP solver, without Pyomo: writes
+    the LP file, runs the solver on it and reads its solution file
+    Parameters:
+        - driver: str, key of DRIVERS
+        - costs: array of floats, costs of seats
+        - weights: array of numbers, voting power of seats
+        - rhs: float, right-hand side of the constraint
+        - verbose: bool, show the output of the solver
+    Returns:
+        - str, status of the solution: optimal, infeasible or other
+        - array of bools, selected seats
+    '''
+    executable, get_args, read = DRIVERS[driver]
+    path = shutil.which(executable)
+    if path is None:
+        raise RuntimeError('Executable {} of solver {} not found'.format(executable, driver))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lp, sol = os.path.join(tmp, 'model.lp'), os.path.join(tmp, 'model.sol')
+
+        with tu.stats.phase('write'):
+            write_lp(lp, costs=costs, weights=weights, rhs=rhs)
+
+        with tu.stats.phase('solver'):
+            subprocess.run([path] + get_args(lp, sol), check=True,
+                    stdout=None if verbose else subprocess.DEVNULL)
+
+        with tu.stats.phase('read'):
+            return read(sol, len(costs))
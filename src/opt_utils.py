@@ -1,12 +1,24 @@
-import pyomo.environ as pe
+import heapq
+from functools import partial
+from itertools import count
+
+import numpy as np
+
+import src.lp_utils as lu
+import src.timing_utils as tu
+
+# Pyomo takes a large share of the start-up time, so it is only imported by the functions that
+# build or solve Pyomo models, not by the native solvers
 
 
 def get_model(n_seats, alpha, costs, weights, mode):
+    import pyomo.environ as pe
+
     model = pe.AbstractModel()
 
     model.N = pe.Param(initialize=n_seats)
     model.alpha = pe.Param(initialize=alpha)
-    model.eps = pe.Param(initialize=1e-3 if mode == 'overtake' else 0)
+    model.eps = pe.Param(initialize=_get_eps(mode))
     
     model.i = pe.RangeSet(model.N)
     model.c = pe.Param(model.i, initialize=dict(zip(range(1, n_seats + 1), costs)))
@@ -15,23 +27,23 @@ def get_model(n_seats, alpha, costs, weights, mode):
     model.x = pe.Var(model.i, domain=pe.Binary)
 
     def c1_rule(model):
-        return sum([model.w[i] * model.x[i] for i in model.i]) >= \
-                model.alpha * sum([model.w[i] for i in model.i]) + model.eps
+        with tu.stats.phase('expressions'):
+            return sum([model.w[i] * model.x[i] for i in model.i]) >= \
+                    model.alpha * sum([model.w[i] for i in model.i]) + model.eps
     model.c1 = pe.Constraint(rule=c1_rule)
     
     
     def obj_rule(model):
-        return sum([model.c[i] * model.x[i] for i in model.i])
+        with tu.stats.phase('expressions'):
+            return sum([model.c[i] * model.x[i] for i in model.i])
     model.obj = pe.Objective(rule=obj_rule, sense=pe.minimize)
 
     return model
 
 
-def solve(model, solver_name, verbose):
-    solver = pe.SolverFactory(solver_name)
-    instance = model.create_instance()
-    results = solver.solve(instance)
-    
+def _check_results(results, verbose):
+    import pyomo.environ as pe
+
     if results.solver.status == pe.SolverStatus.ok and \
             results.solver.termination_condition == pe.TerminationCondition.optimal:
         if verbose:
@@ -42,7 +54,11 @@ def solve(model, solver_name, verbose):
     else:
         print('Something else is wrong: solver status:', results.solver.status)
         exit()
-    
+
+
+def _read_solution(instance):
+    import pyomo.environ as pe
+
     min_voting_power = 0
     adversary_voting_power = 0
     adversary_cost = 0
@@ -51,6 +67,7 @@ def solve(model, solver_name, verbose):
 
     for s, x, w, c in zip(instance.i, instance.x.get_values().values(),
             instance.w.values(), instance.c.values()):
+        w, c = pe.value(w), pe.value(c)
         if x:
             colors += ['green']
             adversary_voting_power += w
@@ -59,6 +76,1130 @@ def solve(model, solver_name, verbose):
         else:
             colors += ['orange']
         min_voting_power += w
-    min_voting_power *= instance.alpha
+    min_voting_power *= pe.value(instance.alpha)
 
     return instance, min_voting_power, adversary_voting_power, adversary_cost, selected_seats, colors
+
+
+def _set_warm_start(instance, solver, warm_start):
+    # warm_start holds the selected seats, returns the keyword arguments of solver.solve
+    if warm_start is None or not solver.warm_start_capable():
+        return {}
+    selected = set(warm_start)
+    for i in instance.i:
+        instance.x[i].set_value(int(i in selected))
+    return {'warmstart': True}
+
+
+def solve(model, solver_name, verbose, warm_start=None):
+    import pyomo.environ as pe
+
+    solver = tu.instrument_solver(pe.SolverFactory(solver_name))
+    with tu.stats.phase('create_instance'):
+        instance = model.create_instance()
+    with tu.stats.phase('solve'):
+        results = solver.solve(instance, **_set_warm_start(instance, solver, warm_start))
+    
+    _check_results(results=results, verbose=verbose)
+
+    with tu.stats.phase('results'):
+        return _read_solution(instance)
+
+
+# committees of at least this many seats are built with get_model_large
+LARGE_MODEL_SEATS = 10**4
+
+
+def get_model_large(n_seats, alpha, costs, weights, mode):
+    '''
+    Builds the model of the minimization knapsack problem for very large committees: a concrete
+    model without indexed parameters, whose constraint and objective are built in bulk as linear
+    expressions straight from the arrays of costs and voting power
+    Parameters:
+        - n_seats: int, number of seats in the committee
+        - alpha: float, fraction of the total voting power
+        - costs: array of floats, costs of seats
+        - weights: array of numbers, voting power of seats
+        - mode: str, either stop or overtake
+    Returns:
+        - pyomo.environ.ConcreteModel, to be solved with solve_large
+    '''
+    import pyomo.environ as pe
+    from pyomo.core.expr.numeric_expr import LinearExpression
+
+    costs = np.asarray(costs, dtype=float)[:n_seats]
+    weights = np.asarray(weights)[:n_seats]
+
+    model = pe.ConcreteModel()
+    model.x = pe.Var(range(n_seats), domain=pe.Binary)
+    x = list(model.x.values())
+
+    with tu.stats.phase('expressions'):
+        model.c1 = pe.Constraint(expr=LinearExpression(constant=0,
+            linear_coefs=weights.tolist(), linear_vars=x) >=
+            float(alpha * weights.sum() + _get_eps(mode)))
+        model.obj = pe.Objective(expr=LinearExpression(constant=0, linear_coefs=costs.tolist(),
+            linear_vars=x), sense=pe.minimize)
+
+    # data needed to read the solution back without walking Pyomo components
+    model.data = (alpha, costs, weights)
+
+    return model
+
+
+def solve_large(model, solver_name, verbose, warm_start=None):
+    '''
+    Solves a model built by get_model_large, returns the same tuple as solve with a Solution,
+    whose selection is a NumPy boolean mask, instead of the Pyomo instance
+    '''
+    import pyomo.environ as pe
+
+    alpha, costs, weights = model.data
+    solver = tu.instrument_solver(pe.SolverFactory(solver_name))
+
+    kwargs = {}
+    if warm_start is not None and solver.warm_start_capable():
+        x = np.zeros(len(costs))
+        x[np.asarray(warm_start, dtype=int) - 1] = 1
+        for v, xx in zip(model.x.values(), x):
+            v.set_value(xx)
+        kwargs = {'warmstart': True}
+
+    with tu.stats.phase('solve'):
+        results = solver.solve(model, **kwargs)
+
+    _check_results(results=results, verbose=verbose)
+
+    with tu.stats.phase('results'):
+        x = np.fromiter((v.value or 0 for v in model.x.values()), dtype=float,
+                count=len(costs)) > 0.5
+        return _unpack(alpha, costs, weights, x)
+
+
+class PersistentModel:
+    '''
+    Concrete Pyomo model of the minimization knapsack problem with mutable costs, voting power and
+    alpha. It is built once and updated in place between solves, e.g. along a sweep. Solvers that
+    have a Pyomo persistent interface (e.g. gurobi, cplex, xpress) are used through it.
+    '''
+    def __init__(self, n_seats, alpha, weights, mode, solver_name, costs=None):
+        import pyomo.environ as pe
+        from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
+
+        costs = np.zeros(n_seats) if costs is None else costs
+
+        model = pe.ConcreteModel()
+        model.i = pe.RangeSet(n_seats)
+        model.alpha = pe.Param(initialize=alpha, mutable=True)
+        model.eps = pe.Param(initialize=_get_eps(mode))
+        model.c = pe.Param(model.i, initialize=dict(zip(model.i, costs)), mutable=True)
+        model.w = pe.Param(model.i, initialize=dict(zip(model.i, weights)), mutable=True)
+
+        model.x = pe.Var(model.i, domain=pe.Binary)
+
+        model.c1 = pe.Constraint(expr=pe.sum_product(model.w, model.x) >=
+                model.alpha * pe.quicksum(model.w.values()) + model.eps)
+        model.obj = pe.Objective(expr=pe.sum_product(model.c, model.x), sense=pe.minimize)
+
+        if solver_name + '_persistent' in pe.SolverFactory:
+            solver_name = solver_name + '_persistent'
+        self.solver = tu.instrument_solver(pe.SolverFactory(solver_name))
+        self.persistent = isinstance(self.solver, PersistentSolver)
+        if self.persistent:
+            self.solver.set_instance(model)
+
+        self.model = model
+        self.costs = np.array(costs)
+        self.weights = np.array(weights)
+        self.alpha = alpha
+
+    def update(self, costs=None, weights=None, alpha=None):
+        '''
+        Updates parameters of the model in place, None or unchanged values leave a parameter as is
+        '''
+        with tu.stats.phase('update'):
+            return self._update(costs=costs, weights=weights, alpha=alpha)
+
+    def _update(self, costs, weights, alpha):
+        model = self.model
+
+        costs = None if costs is None or np.array_equal(costs, self.costs) else np.array(costs)
+        weights = None if weights is None or np.array_equal(weights, self.weights) else \
+                np.array(weights)
+        alpha = None if alpha is None or alpha == self.alpha else alpha
+
+        if costs is not None:
+            model.c.store_values(dict(zip(model.i, costs)))
+            self.costs = costs
+        if weights is not None:
+            model.w.store_values(dict(zip(model.i, weights)))
+            self.weights = weights
+        if alpha is not None:
+            model.alpha.set_value(alpha)
+            self.alpha = alpha
+
+        if self.persistent:
+            if weights is not None or alpha is not None:
+                self.solver.remove_constraint(model.c1)
+                self.solver.add_constraint(model.c1)
+            if costs is not None:
+                self.solver.set_objective(model.obj)
+
+        return self
+
+    def solve(self, verbose, warm_start=None):
+        '''
+        Solves the model with its current parameters, returns the same tuple as solve. The seats
+        in warm_start are passed to the solver as a MIP start if it supports one.
+        '''
+        kwargs = _set_warm_start(self.model, self.solver, warm_start)
+        with tu.stats.phase('solve'):
+            if self.persistent:
+                results = self.solver.solve(load_solutions=True, **kwargs)
+            else:
+                results = self.solver.solve(self.model, **kwargs)
+
+        _check_results(results=results, verbose=verbose)
+
+        with tu.stats.phase('results'):
+            return _read_solution(self.model)
+
+
+def get_persistent_model(n_seats, alpha, weights, mode, solver_name):
+    '''
+    Builds the PersistentModel reused along a sweep, or returns None when optimize has to build
+    the models itself: for native solvers, and for committees of at least LARGE_MODEL_SEATS seats,
+    whose per-seat mutable parameters are slower to build and update than the bulk expressions of
+    get_model_large
+    Parameters:
+        - n_seats, alpha, weights, mode, solver_name: see PersistentModel
+    Returns:
+        - PersistentModel or None
+    '''
+    if solver_name in NATIVE_SOLVERS or n_seats >= LARGE_MODEL_SEATS:
+        return None
+    return PersistentModel(n_seats=n_seats, alpha=alpha, weights=weights, mode=mode,
+            solver_name=solver_name)
+
+
+class Solution:
+    ''' Solved problem returned by the native solvers in place of a Pyomo instance
+    '''
+    def __init__(self, alpha, costs, weights, x):
+        self.alpha = alpha
+        self.c = np.asarray(costs)
+        self.w = np.asarray(weights)
+        self.x = np.asarray(x, dtype=bool)
+
+
+def _get_eps(mode):
+    return 1e-3 if mode == 'overtake' else 0
+
+
+def _check_weights(weights):
+    weights = np.asarray(weights)
+    if not np.all(np.equal(np.mod(weights, 1), 0)) or (weights < 0).any():
+        raise ValueError('Native solvers require non-negative integer voting power')
+    return weights.astype(np.int64)
+
+
+def get_min_power(alpha, weights, mode):
+    '''
+    Computes the minimum integer voting power the attacker has to obtain, i.e. the smallest
+    integer satisfying the constraint of the model built by get_model
+    Parameters:
+        - alpha: float, fraction of the total voting power
+        - weights: array of integers, voting power of seats
+        - mode: str, either stop or overtake
+    Returns:
+        - int
+    '''
+    # the tolerance absorbs rounding of alpha * total, as MIP solvers do
+    return max(int(np.ceil(alpha * np.sum(weights) + _get_eps(mode) - 1e-9)), 0)
+
+
+def _unpack(alpha, costs, weights, x):
+    x = np.asarray(x, dtype=bool)
+    min_voting_power = alpha * weights.sum()
+    adversary_voting_power = weights[x].sum()
+    adversary_cost = costs[x].sum()
+    selected_seats = (np.flatnonzero(x) + 1).tolist()
+    colors = ['green' if xx else 'orange' for xx in x]
+
+    return Solution(alpha, costs, weights, x), min_voting_power, adversary_voting_power, \
+            adversary_cost, selected_seats, colors
+
+
+def _dp_step(dp, c, w, width):
+    '''
+    Adds a seat of cost c and voting power w to a DP table, where dp[..., v] is the minimum cost
+    to obtain voting power of at least v < width; c may be a column of costs, one per row of dp
+    '''
+    new = dp.copy()
+    w = min(w, width - 1)
+    new[..., 1:w+1] = np.minimum(dp[..., 1:w+1], c)
+    new[..., w+1:] = np.minimum(dp[..., w+1:], dp[..., 1:width-w] + c)
+    return new
+
+
+def solve_dp(n_seats, alpha, costs, weights, mode, verbose=False):
+    '''
+    Solves the minimization knapsack problem exactly by dynamic programming over integer voting
+    power, without building a Pyomo model
+    Parameters:
+        - n_seats: int, number of seats in the committee
+        - alpha: float, fraction of the total voting power
+        - costs: array of floats, costs of seats
+        - weights: array of non-negative integers, voting power of seats
+        - mode: str, either stop or overtake
+        - verbose: bool, verbose outputs
+    Returns:
+        - the same tuple as solve, with a Solution instead of the Pyomo instance
+    '''
+    costs = np.asarray(costs, dtype=float)[:n_seats]
+    weights = _check_weights(weights)[:n_seats]
+    target = get_min_power(alpha, weights, mode)
+
+    if target > weights.sum():
+        print('The model is infeasible')
+        exit()
+
+    # dp[v] is the minimum cost to obtain voting power of at least v
+    dp = np.full(target + 1, np.inf)
+    dp[0] = 0
+    take = np.zeros((n_seats, target + 1), dtype=bool)
+
+    for i, (c, w) in enumerate(zip(costs, weights)):
+        if w == 0:
+            continue
+        new = _dp_step(dp, c, w, target + 1)
+        take[i] = new < dp
+        dp = new
+
+    x = np.zeros(n_seats, dtype=bool)
+    v = target
+    for i in range(n_seats - 1, -1, -1):
+        if take[i, v]:
+            x[i] = True
+            v = max(v - weights[i], 0)
+
+    if verbose:
+        print('Solution is optimal and feasible')
+
+    return _unpack(alpha, costs, weights, x)
+
+
+def get_sensitivity(alpha, costs, weights, mode, max_table_size=2**27):
+    '''
+    Computes for every seat the minimum attacker cost when the seat is forced into or out of the
+    selection, in O(n_seats * target) time overall. A forward DP table holds the minimum cost to
+    obtain every voting power up to the target with the seats before a given one, and a backward
+    DP over the seats after it is run alongside; combining both at every split of the target gives
+    the optimum without the seat, and with it once its voting power is subtracted.
+    Parameters:
+        - alpha: float, fraction of the total voting power
+        - costs: array of floats, costs of seats
+        - weights: array of non-negative integers, voting power of seats
+        - mode: str, either stop or overtake
+        - max_table_size: int, maximum number of entries in the forward DP table, larger
+          committees raise ValueError
+    Returns:
+        - array of floats, minimum attacker cost with each seat forced in
+        - array of floats, minimum attacker cost with each seat forced out, inf if the other
+          seats cannot reach the target
+    '''
+    costs = np.asarray(costs, dtype=float)
+    weights = _check_weights(weights)
+    n_seats = len(costs)
+    target = get_min_power(alpha, weights, mode)
+    if n_seats * (target + 1) > max_table_size:
+        raise ValueError('The committee is too large to compute the cost with every seat forced '
+                'into or out of the selection')
+
+    empty = np.full(target + 1, np.inf)
+    empty[0] = 0
+
+    # forward[i] covers the seats before seat i
+    forward = np.empty((n_seats, target + 1))
+    dp = empty
+    for i, (c, w) in enumerate(zip(costs, weights)):
+        forward[i] = dp
+        if w > 0:
+            dp = _dp_step(dp, c, w, target + 1)
+
+    forced_in = np.empty(n_seats)
+    forced_out = np.empty(n_seats)
+    # backward covers the seats after seat i
+    backward = empty
+    for i in range(n_seats - 1, -1, -1):
+        forced_out[i] = np.min(forward[i] + backward[::-1])
+        rest = max(target - weights[i], 0)
+        forced_in[i] = costs[i] + np.min(forward[i][:rest+1] + backward[rest::-1])
+        if weights[i] > 0:
+            backward = _dp_step(backward, costs[i], weights[i], target + 1)
+
+    return forced_in, forced_out
+
+
+def get_threshold_curve(costs, weights):
+    '''
+    Computes the minimum attacker cost to obtain every voting power from 0 to the total voting
+    power with one pass of the DP of solve_dp. The cost to stop or overtake the committee, or to
+    pass any other quorum, is read off the curve at get_min_power(alpha, weights, mode).
+    Parameters:
+        - costs: array of floats, costs of seats
+        - weights: array of non-negative integers, voting power of seats
+    Returns:
+        - array of floats of length sum(weights) + 1, minimum cost to obtain voting power of at
+          least its index
+    '''
+    costs = np.asarray(costs, dtype=float)
+    weights = _check_weights(weights)
+    total = int(weights.sum())
+
+    curve = np.full(total + 1, np.inf)
+    curve[0] = 0
+    for c, w in zip(costs, weights):
+        if w > 0:
+            curve = _dp_step(curve, c, w, total + 1)
+
+    return curve
+
+
+def get_top_solutions(alpha, costs, weights, mode, top_k, max_table_size=2**27):
+    '''
+    Enumerates the top_k cheapest distinct selections of seats reaching the voting power required
+    to stop or overtake the committee. The forward table of solve_dp gives the exact minimum cost
+    of completing any partial selection, so a best-first search over the decisions on seats, from
+    the last one to the first, with a priority queue pops complete selections in order of cost and
+    only expands O(top_k * n_seats) partial ones.
+    Parameters:
+        - alpha: float, fraction of the total voting power
+        - costs: array of floats, costs of seats
+        - weights: array of non-negative integers, voting power of seats
+        - mode: str, either stop or overtake
+        - top_k: int, number of selections
+        - max_table_size: int, maximum number of entries in the forward DP table, larger
+          committees raise ValueError
+    Returns:
+        - list of up to top_k tuples (cost, voting power, selected seats) in order of cost
+    '''
+    costs = np.asarray(costs, dtype=float)
+    weights = _check_weights(weights)
+    n_seats = len(costs)
+    target = get_min_power(alpha, weights, mode)
+    if (n_seats + 1) * (target + 1) > max_table_size:
+        raise ValueError('The committee is too large to list the cheapest sets of seats')
+
+    # forward[i][v] is the minimum cost to obtain voting power of at least v with seats before i
+    forward = np.full((n_seats + 1, target + 1), np.inf)
+    forward[0, 0] = 0
+    for i, (c, w) in enumerate(zip(costs, weights)):
+        forward[i+1] = _dp_step(forward[i], c, w, target + 1)
+
+    # a partial selection has decided on seats from i on, still needs voting power of at least
+    # `missing`; chosen links the seats it selected
+    tie = count()
+    queue = [(forward[n_seats, target], next(tie), 0.0, n_seats, target, None)]
+    solutions = []
+    while queue and len(solutions) < top_k:
+        _, _, cost, i, missing, chosen = heapq.heappop(queue)
+        if i == 0:
+            seats = []
+            while chosen is not None:
+                seats += [chosen[0] + 1]
+                chosen = chosen[1]
+            solutions += [(cost, int(weights[np.asarray(seats, dtype=int) - 1].sum()), seats)]
+            continue
+
+        i -= 1
+        for c, m, ch in [(cost, missing, chosen),
+                (cost + costs[i], max(missing - weights[i], 0), (i, chosen))]:
+            bound = c + forward[i, m]
+            if bound < np.inf:
+                heapq.heappush(queue, (bound, next(tie), c, i, m, ch))
+
+    return solutions
+
+
+def solve_dp_batch(alpha, costs, weights, mode, max_table_size=2**27, cache=None):
+    '''
+    Solves the minimization knapsack problem for many cost vectors sharing the same voting power
+    by running the dynamic program of solve_dp on all of them at once
+    Parameters:
+        - alpha: float, fraction of the total voting power
+        - costs: 2-D array of floats, one row of seat costs per problem
+        - weights: array of non-negative integers, voting power of seats
+        - mode: str, either stop or overtake
+        - max_table_size: int, maximum number of entries in the backtracking table, rows are
+          processed in chunks to stay below it
+        - cache: cache_utils.SolveCache, only rows missing in it are solved, if given
+    Returns:
+        - attacker_costs: array of floats, minimum attacker cost of every row
+        - selected: 2-D boolean array, seats selected by the attacker in every row
+    '''
+    with tu.stats.solve(), tu.stats.phase('native'):
+        return _solve_dp_batch(alpha=alpha, costs=costs, weights=weights, mode=mode,
+                max_table_size=max_table_size, cache=cache)
+
+
+def _solve_dp_batch(alpha, costs, weights, mode, max_table_size, cache):
+    costs = np.atleast_2d(np.asarray(costs, dtype=float))
+    weights = _check_weights(weights)
+    n_rows, n_seats = costs.shape
+    target = get_min_power(alpha, weights, mode)
+
+    if target > weights.sum():
+        print('The model is infeasible')
+        exit()
+
+    attacker_costs = np.empty(n_rows)
+    selected = np.zeros((n_rows, n_seats), dtype=bool)
+    chunk = max(max_table_size // (n_seats * (target + 1)), 1)
+
+    todo = np.arange(n_rows)
+    if cache is not None:
+        keys = [cache.key(costs=c, weights=weights, alpha=alpha, mode=mode, solver_name='dp')
+                for c in costs]
+        hit = np.zeros(n_rows, dtype=bool)
+        for r, key in enumerate(keys):
+            entry = cache.get(key)
+            if entry is not None:
+                hit[r] = True
+                attacker_costs[r] = entry[0]
+                selected[r, np.asarray(entry[1], dtype=int) - 1] = True
+        todo = np.flatnonzero(~hit)
+
+    for start in range(0, len(todo), chunk):
+        c = costs[todo[start:start+chunk]]
+        rows = np.arange(c.shape[0])
+
+        dp = np.full((c.shape[0], target + 1), np.inf)
+        dp[:, 0] = 0
+        take = np.zeros((n_seats, c.shape[0], target + 1), dtype=bool)
+
+        for i, w in enumerate(weights):
+            if w == 0:
+                continue
+            new = _dp_step(dp, c[:, i:i+1], w, target + 1)
+            take[i] = new < dp
+            dp = new
+
+        v = np.full(c.shape[0], target)
+        for i in range(n_seats - 1, -1, -1):
+            x = take[i, rows, v]
+            selected[todo[start + rows], i] = x
+            v = np.where(x, np.maximum(v - weights[i], 0), v)
+
+        attacker_costs[todo[start:start+chunk]] = dp[:, target]
+
+    if cache is not None:
+        for r in todo:
+            cache.put(keys[r], attacker_cost=attacker_costs[r],
+                    selected_seats=np.flatnonzero(selected[r]) + 1)
+
+    return attacker_costs, selected
+
+
+def get_attacker_costs_batch(alpha, costs, weights, mode, max_table_size=2**24):
+    '''
+    Computes the minimum attacker cost of many problems at once, each with its own costs and
+    voting power (e.g. random committees), by running the dynamic program of solve_dp on all of
+    them together. Only costs are computed, so no backtracking table is kept.
+    Parameters:
+        - alpha: float, fraction of the total voting power
+        - costs: 2-D array of non-negative floats, one row of seat costs per problem
+        - weights: 2-D array of non-negative integers, one row of voting power per problem, or
+          an array shared by all problems
+        - mode: str, either stop or overtake
+        - max_table_size: int, maximum number of entries in the DP table, rows are processed in
+          chunks to stay below it
+    Returns:
+        - array of floats, minimum attacker cost of every problem, inf if it is infeasible
+    '''
+    costs = np.atleast_2d(np.asarray(costs, dtype=float))
+    weights = np.broadcast_to(_check_weights(weights), costs.shape)
+    n_rows, n_seats = costs.shape
+    targets = np.maximum(np.ceil(alpha * weights.sum(axis=1) + _get_eps(mode) - 1e-9), 0).\
+            astype(np.int64)
+
+    attacker_costs = np.empty(n_rows)
+    width = int(targets.max(initial=0)) + 1
+    chunk = max(max_table_size // width, 1)
+
+    for start in range(0, n_rows, chunk):
+        c = costs[start:start+chunk]
+        w = weights[start:start+chunk]
+
+        # dp[r, v] is the minimum cost to obtain voting power of at least v in row r; rows
+        # where the seat has the same voting power are updated together, as in solve_dp
+        dp = np.full((c.shape[0], width), np.inf)
+        dp[:, 0] = 0
+        for i in range(n_seats):
+            new = dp.copy()
+            for v in np.unique(w[:, i]):
+                if v == 0:
+                    continue
+                rows = np.flatnonzero(w[:, i] == v)
+                new[rows] = _dp_step(dp[rows], c[rows, i:i+1], v, width)
+            dp = new
+
+        t = targets[start:start+chunk]
+        attacker_costs[start:start+chunk] = np.where(t < width, dp[np.arange(c.shape[0]),
+            np.minimum(t, width - 1)], np.inf)
+
+    return attacker_costs
+
+
+def _lp_relaxation(costs, weights, target):
+    # take seats greedily by cost per unit of voting power, the last one fractionally
+    idx = np.flatnonzero(weights > 0)
+    idx = idx[np.argsort(costs[idx] / weights[idx], kind='stable')]
+    cum_power = np.cumsum(weights[idx])
+    last = min(np.searchsorted(cum_power, target), len(idx) - 1) if target > 0 else -1
+    lp_x = np.zeros(len(costs))
+    lp_x[idx[:last+1]] = 1
+    if last >= 0:
+        lp_x[idx[last]] = 1 - max(cum_power[last] - target, 0) / weights[idx[last]]
+
+    return costs @ lp_x, lp_x
+
+
+def get_lp_bound(alpha, costs, weights, mode):
+    '''
+    Computes the optimal value of the LP relaxation of the problem, a lower bound on the minimum
+    attacker cost. For integer voting power the rounded-up target of get_min_power is used,
+    which gives a tighter bound.
+    Parameters:
+        - alpha: float, fraction of the total voting power
+        - costs: array of non-negative floats, costs of seats
+        - weights: array of non-negative numbers, voting power of seats
+        - mode: str, either stop or overtake
+    Returns:
+        - float
+    '''
+    costs = np.asarray(costs, dtype=float)
+    weights = np.asarray(weights)
+
+    return _lp_relaxation(costs=costs, weights=weights,
+            target=_get_target(alpha, weights, mode))[0]
+
+
+def _get_target(alpha, weights, mode):
+    if np.all(np.equal(np.mod(weights, 1), 0)):
+        return get_min_power(alpha, weights, mode)
+    return alpha * weights.sum() + _get_eps(mode)
+
+
+def is_certified(alpha, costs, weights, mode, x, rtol=1e-9):
+    '''
+    Checks whether a selection of seats is feasible and provably optimal, i.e. its cost attains
+    the LP relaxation bound. This is cheap and lets a sweep reuse the previous optimum.
+    Parameters:
+        - alpha: float, fraction of the total voting power
+        - costs: array of non-negative floats, costs of seats
+        - weights: array of non-negative numbers, voting power of seats
+        - mode: str, either stop or overtake
+        - x: boolean array, selected seats
+        - rtol: float, relative tolerance of the comparison with the bound
+    Returns:
+        - bool
+    '''
+    weights = np.asarray(weights)
+    if weights[x].sum() < alpha * weights.sum() + _get_eps(mode) - 1e-9:
+        return False
+    bound = get_lp_bound(alpha=alpha, costs=costs, weights=weights, mode=mode)
+    return np.sum(costs[x]) <= bound + rtol * max(abs(bound), 1)
+
+
+def get_greedy_solution(alpha, costs, weights, mode):
+    '''
+    Finds a feasible selection of seats in O(n log n) by rounding the LP relaxation: either its
+    fractional seat is rounded up or the remaining voting power is covered by the cheapest seat
+    that suffices, whichever is cheaper, and seats left redundant are dropped, most expensive
+    first. Its cost is an upper bound on the minimum attacker cost.
+    Parameters:
+        - alpha: float, fraction of the total voting power
+        - costs: array of non-negative floats, costs of seats
+        - weights: array of non-negative numbers, voting power of seats
+        - mode: str, either stop or overtake
+    Returns:
+        - boolean array, selected seats, None if the problem is infeasible
+        - float, LP relaxation bound, a lower bound on the minimum attacker cost
+    '''
+    costs = np.asarray(costs, dtype=float)
+    weights = np.asarray(weights)
+    target = _get_target(alpha, weights, mode)
+    lower_bound, lp_x = _lp_relaxation(costs=costs, weights=weights, target=target)
+
+    x = lp_x > 0
+    if weights[x].sum() < target - 1e-9:
+        return None, lower_bound
+
+    base = lp_x == 1
+    missing = target - weights[base].sum()
+    if missing > 1e-9:
+        cover = np.flatnonzero(~base & (weights >= missing - 1e-9))
+        y = base.copy()
+        y[cover[np.argmin(costs[cover])]] = True
+        if costs[y].sum() < costs[x].sum():
+            x = y
+
+    # only seats with no more voting power than the surplus can be redundant
+    slack = weights[x].sum() - target
+    redundant = np.flatnonzero(x & (weights <= slack + 1e-9))
+    for i in redundant[np.argsort(-costs[redundant], kind='stable')]:
+        if weights[i] <= slack + 1e-9:
+            x[i] = False
+            slack -= weights[i]
+
+    return x, lower_bound
+
+
+def optimize_approx(n_seats, alpha, costs, weights, mode, solver_name, verbose, tol, model=None,
+        cache=None, epsilon=0.01):
+    '''
+    Solves the minimization knapsack problem approximately with get_greedy_solution and solves it
+    with optimize only if the relative gap between the greedy cost and the LP relaxation bound
+    exceeds tol. The greedy selection is then passed to optimize as a warm start. The returned
+    gap always bounds the relative error (cost - optimum) / cost: the guarantee of the solver
+    escalated to is carried through, rather than escalation being limited to exact solvers. The
+    gap is 0 after an exact solver, Pyomo solvers being run to optimality, and after fptas the
+    smaller of epsilon and the gap to the LP relaxation bound, so it may exceed tol.
+    Parameters:
+        - n_seats, alpha, costs, weights, mode, solver_name, verbose, model, cache, epsilon: see
+          optimize
+        - tol: float, maximum relative gap of an approximate solution
+    Returns:
+        - the same tuple as optimize
+        - float, bound on the relative error of the returned cost, see above
+    '''
+    costs = np.asarray(costs, dtype=float)[:n_seats]
+    weights = np.asarray(weights)[:n_seats]
+
+    with tu.stats.solve():
+        with tu.stats.phase('approx'):
+            x, lower_bound = get_greedy_solution(alpha=alpha, costs=costs, weights=weights,
+                    mode=mode)
+        if x is not None:
+            upper_bound = costs[x].sum()
+            gap = max(upper_bound - lower_bound, 0) / upper_bound if upper_bound > 0 else 0.0
+            if gap <= tol:
+                if verbose:
+                    print('Approximate solution within {:.3g} of the LP relaxation bound'.format(
+                        gap))
+                return _unpack(alpha, costs, weights, x), gap
+            if verbose:
+                print('Gap of the approximate solution {:.3g} exceeds {:.3g}, solving exactly'.\
+                        format(gap, tol))
+
+        result = optimize(n_seats=n_seats, alpha=alpha, costs=costs, weights=weights, mode=mode,
+                solver_name=solver_name, verbose=verbose, model=model, cache=cache,
+                warm_start=None if x is None else (np.flatnonzero(x) + 1).tolist(),
+                epsilon=epsilon)
+
+    if solver_name != 'fptas':
+        return result, 0.0
+    # fptas is within a factor 1 + epsilon of the optimum, which is at least the LP bound
+    cost = result[3]
+    gap = max(cost - lower_bound, 0) / cost if cost > 0 else 0.0
+    return result, min(gap, epsilon)
+
+
+def solve_kscheme(n_seats, alpha, costs, weights, mode, verbose=False, max_work=2**28,
+        max_table_size=2**27):
+    '''
+    Solves the minimization knapsack problem exactly when the voting power takes only a few
+    distinct values, as in the k-scheme of data_gen.get_voting_power. Within a class of equal
+    voting power the attacker takes the cheapest seats, so only the number of seats taken from
+    each class has to be found. By the proximity theorem of Hochbaum and Shanthikumar, an optimal
+    vector of counts lies within (number of classes) * (maximum voting power) of the LP
+    relaxation optimum. A DP over the classes, whose state is the voting power gained above the
+    lower ends of these windows of counts, then finds the counts from prefix sums of sorted costs
+    in time independent of the number of seats. Falls back to solve_dp if the windows are too
+    wide, unless its table would be too large too.
+    Parameters:
+        - n_seats: int, number of seats in the committee
+        - alpha: float, fraction of the total voting power
+        - costs: array of floats, costs of seats
+        - weights: array of non-negative integers, voting power of seats
+        - mode: str, either stop or overtake
+        - verbose: bool, verbose outputs
+        - max_work: int, maximum number of DP entries to compute over the windows
+        - max_table_size: int, maximum number of entries in the table of the solve_dp fallback
+    Returns:
+        - the same tuple as solve, with a Solution instead of the Pyomo instance
+    '''
+    costs = np.asarray(costs, dtype=float)[:n_seats]
+    weights = _check_weights(weights)[:n_seats]
+    target = get_min_power(alpha, weights, mode)
+
+    if target > weights.sum():
+        print('The model is infeasible')
+        exit()
+
+    values = np.unique(weights[weights > 0])
+    radius = len(values) * (values.max() if len(values) else 0)
+
+    _, lp_x = _lp_relaxation(costs=costs, weights=weights, target=target)
+
+    orders, prefixes, windows = [], [], []
+    for v in values:
+        members = np.flatnonzero(weights == v)
+        order = members[np.argsort(costs[members], kind='stable')]
+        m = lp_x[members].sum()
+        orders += [order]
+        prefixes += [np.concatenate(([0.0], np.cumsum(costs[order])))]
+        windows += [(max(int(np.floor(m - radius)), 0), min(int(np.ceil(m + radius)), len(order)))]
+
+    # dp[o] is the minimum cost of the classes so far to gain voting power of at least o above
+    # the lower ends of the windows, capped at the power still missing there
+    missing = max(target - sum(int(v) * lo for v, (lo, _) in zip(values, windows)), 0)
+    width = min(missing, sum(int(v) * (hi - lo) for v, (lo, hi) in zip(values, windows))) + 1
+    work = width * sum(hi - lo + 1 for lo, hi in windows)
+
+    dp = np.full(width, np.inf)
+    dp[0] = sum(prefix[lo] for prefix, (lo, _) in zip(prefixes, windows))
+    choices = []
+    if work <= max_work:
+        for v, prefix, (lo, hi) in zip(values, prefixes, windows):
+            new = np.full(width, np.inf)
+            choice = np.zeros(width, dtype=np.int64)
+            for t in range(hi - lo + 1):
+                shift = min(int(v) * t, width - 1)
+                cand = np.concatenate((np.full(shift, dp[0]), dp[:width-shift])) + \
+                        prefix[lo + t] - prefix[lo]
+                better = cand < new
+                new[better] = cand[better]
+                choice[better] = t
+            choices += [choice]
+            dp = new
+
+    if work > max_work or not np.isfinite(dp[-1]):
+        if n_seats * (target + 1) > max_table_size:
+            raise ValueError('Voting power takes too many distinct values for kscheme and the '
+                    'committee is too large for dp, use a MIP solver')
+        if verbose:
+            print('Too many classes of voting power, falling back to the DP solver')
+        return solve_dp(n_seats=n_seats, alpha=alpha, costs=costs, weights=weights, mode=mode,
+                verbose=verbose)
+
+    x = np.zeros(n_seats, dtype=bool)
+    o = width - 1
+    for v, order, (lo, _), choice in reversed(list(zip(values, orders, windows, choices))):
+        t = choice[o]
+        x[order[:lo + t]] = True
+        o = max(o - int(v) * t, 0)
+
+    if verbose:
+        print('Solution is optimal and feasible')
+
+    return _unpack(alpha, costs, weights, x)
+
+
+def _scaled_dp(costs, weights, target, scale, max_cost):
+    # seats costing more than max_cost are left out, the others cost at most max_cost / scale
+    # once scaled down and rounded, which bounds the DP over scaled costs
+    items = np.flatnonzero((costs <= max_cost) & (weights > 0))
+    scaled = np.floor(costs[items] / scale).astype(np.int64)
+    budget = int(np.floor(max_cost / scale))
+
+    # power[b] is the maximum voting power of seats of scaled cost at most b
+    power = np.zeros(budget + 1)
+    take = np.zeros((len(items), budget + 1), dtype=bool)
+    for j, (c, w) in enumerate(zip(scaled, weights[items])):
+        new = power.copy()
+        new[c:] = np.maximum(power[c:], power[:budget+1-c] + w)
+        take[j] = new > power
+        power = new
+
+    reached = np.flatnonzero(power >= target - 1e-9 * max(target, 1))
+    if not len(reached):
+        return None
+
+    x = np.zeros(len(costs), dtype=bool)
+    b = reached[0]
+    for j in range(len(items) - 1, -1, -1):
+        if take[j, b]:
+            x[items[j]] = True
+            b -= scaled[j]
+    return x
+
+
+def solve_fptas(n_seats, alpha, costs, weights, mode, verbose=False, epsilon=0.01):
+    '''
+    Solves the minimization knapsack problem within a factor 1 + epsilon of the optimum for any
+    non-negative voting power, e.g. large or fractional stakes. Costs are scaled down by
+    K = epsilon * G / (2 * n_seats) and rounded, and a DP over scaled costs finds the maximum
+    voting power for every scaled budget up to G / K. The guess G of the optimum starts at the LP
+    relaxation bound and doubles until the DP reaches the target, then the error of rounding is at
+    most epsilon * G / 2, and G is less than twice the optimum. Runs in O(n_seats^2 / epsilon)
+    time and memory per guess, whatever the magnitude of the voting power.
+    Parameters:
+        - n_seats: int, number of seats in the committee
+        - alpha: float, fraction of the total voting power
+        - costs: array of non-negative floats, costs of seats
+        - weights: array of non-negative numbers, voting power of seats
+        - mode: str, either stop or overtake
+        - verbose: bool, verbose outputs
+        - epsilon: float, maximum relative error of the cost
+    Returns:
+        - the same tuple as solve, with a Solution instead of the Pyomo instance
+    '''
+    costs = np.asarray(costs, dtype=float)[:n_seats]
+    weights = np.asarray(weights)[:n_seats]
+    if (weights < 0).any():
+        raise ValueError('FPTAS requires non-negative voting power')
+
+    x, lower_bound = get_greedy_solution(alpha=alpha, costs=costs, weights=weights, mode=mode)
+    if x is None:
+        print('The model is infeasible')
+        exit()
+    upper_bound = costs[x].sum()
+    target = _get_target(alpha, weights, mode)
+
+    guess = lower_bound
+    while upper_bound > (1 + epsilon) * lower_bound:
+        # the greedy selection costs at least the optimum, so the DP succeeds from there on
+        guess = min(guess, upper_bound)
+        y = _scaled_dp(costs=costs, weights=weights.astype(float), target=target,
+                scale=epsilon * guess / (2 * n_seats), max_cost=guess)
+        if y is not None:
+            if costs[y].sum() < upper_bound:
+                x = y
+            break
+        # the DP misses the target only if the optimum exceeds the guess
+        lower_bound = guess
+        guess *= 2
+
+    if verbose:
+        print('Solution is feasible and within a factor {} of the optimum'.format(1 + epsilon))
+
+    return _unpack(alpha, costs, weights, x)
+
+
+def _set_cost(get_costs, s, selected):
+    return np.sum(get_costs(s)[np.asarray(selected, dtype=int) - 1])
+
+
+def parametric_sweep(get_costs, solve, s_min, s_max, n_init=4, tol=1e-9):
+    '''
+    Finds the values of a parameter s (e.g. the Zipf coefficient) in [s_min, s_max] where the
+    optimal selection of seats changes. Since the voting power does not depend on s, every
+    selection stays feasible, and the cost of a fixed selection is a closed-form function of s.
+    For an interval whose ends have different optima, the point where their costs cross is found
+    by bisection on the closed form and solved once: if no other selection is cheaper there, it
+    is the breakpoint, otherwise both halves are searched again. Intervals whose ends share the
+    optimum are assumed to keep it, hence the n_init initial intervals guard against changes
+    that revert inside one of them.
+    Parameters:
+        - get_costs: callable, returns the array of costs of seats for a given s
+        - solve: callable, returns the list of selected seats for a given array of costs
+        - s_min: float, minimum value of s
+        - s_max: float, maximum value of s
+        - n_init: int, number of initial intervals
+        - tol: float, intervals shorter than tol are not searched further
+    Returns:
+        - breakpoints: array of floats, values of s where the optimal selection changes
+        - selections: list of optimal selections, one per piece between breakpoints
+    '''
+    def cheaper(s, a, b):
+        return _set_cost(get_costs, s, a) - _set_cost(get_costs, s, b)
+
+    def search(lo, hi, sel_lo, sel_hi):
+        if sorted(sel_lo) == sorted(sel_hi):
+            return [], [sel_lo]
+
+        # bisection on the cost difference, negative at lo and positive at hi
+        a, b = lo, hi
+        while b - a > tol:
+            m = (a + b) / 2
+            if cheaper(m, sel_lo, sel_hi) <= 0:
+                a = m
+            else:
+                b = m
+        cross = (a + b) / 2
+
+        if hi - lo <= tol:
+            return [cross], [sel_lo, sel_hi]
+
+        sel = solve(get_costs(cross))
+        best = min(_set_cost(get_costs, cross, sel_lo), _set_cost(get_costs, cross, sel_hi))
+        if _set_cost(get_costs, cross, sel) >= best - 1e-12 * max(abs(best), 1):
+            return [cross], [sel_lo, sel_hi]
+
+        left_bps, left_sels = search(lo, cross, sel_lo, sel)
+        right_bps, right_sels = search(cross, hi, sel, sel_hi)
+        return left_bps + right_bps, left_sels[:-1] + right_sels
+
+    grid = np.linspace(s_min, s_max, n_init + 1)
+    sels = [solve(get_costs(s)) for s in grid]
+
+    breakpoints, selections = [], [sels[0]]
+    for lo, hi, sel_lo, sel_hi in zip(grid[:-1], grid[1:], sels[:-1], sels[1:]):
+        bps, ss = search(lo, hi, sel_lo, sel_hi)
+        breakpoints += bps
+        selections += ss[1:]
+
+    # adjacent pieces may share a selection when it was found again after a cross check
+    keep = [i for i in range(len(breakpoints))
+            if sorted(selections[i]) != sorted(selections[i+1])]
+    selections = [selections[0]] + [selections[i+1] for i in keep]
+
+    return np.array([breakpoints[i] for i in keep]), selections
+
+
+def evaluate_sweep(get_costs, breakpoints, selections, s):
+    '''
+    Evaluates the piecewise attacker cost found by parametric_sweep at given values of s
+    Parameters:
+        - get_costs: callable, returns the array of costs of seats for a given s
+        - breakpoints: array of floats, values of s where the optimal selection changes
+        - selections: list of optimal selections, one per piece between breakpoints
+        - s: array of floats, values of s
+    Returns:
+        - array of floats, attacker cost at every value of s
+    '''
+    pieces = np.searchsorted(breakpoints, s)
+    return np.array([_set_cost(get_costs, ss, selections[p]) for ss, p in zip(s, pieces)])
+
+
+def solve_lp(n_seats, alpha, costs, weights, mode, verbose=False, driver='glpk'):
+    '''
+    Solves the minimization knapsack problem with a command line MIP solver (see
+    lp_utils.DRIVERS) on an LP file written straight from the arrays, without building a Pyomo
+    model
+    Parameters:
+        - n_seats: int, number of seats in the committee
+        - alpha: float, fraction of the total voting power
+        - costs: array of floats, costs of seats
+        - weights: array of numbers, voting power of seats
+        - mode: str, either stop or overtake
+        - verbose: bool, verbose outputs
+        - driver: str, key of lp_utils.DRIVERS
+    Returns:
+        - the same tuple as solve, with a Solution instead of the Pyomo instance
+    '''
+    costs = np.asarray(costs, dtype=float)[:n_seats]
+    weights = np.asarray(weights)[:n_seats]
+
+    status, x = lu.run(driver=driver, costs=costs, weights=weights,
+            rhs=alpha * weights.sum() + _get_eps(mode), verbose=verbose)
+
+    if status == 'optimal':
+        if verbose:
+            print('Solution is optimal and feasible')
+    elif status == 'infeasible':
+        print('The model is infeasible')
+        exit()
+    else:
+        print('Something else is wrong: solver status:', status)
+        exit()
+
+    return _unpack(alpha, costs, weights, x)
+
+
+# MIP solvers run on LP files written by lp_utils, named lp_ followed by the key of the driver
+LP_SOLVERS = {'lp_' + d: partial(solve_lp, driver=d) for d in lu.DRIVERS}
+
+NATIVE_SOLVERS = {
+        'dp': solve_dp,
+        'kscheme': solve_kscheme,
+        'fptas': solve_fptas,
+        **LP_SOLVERS,
+        }
+
+
+def _optimize(n_seats, alpha, costs, weights, mode, solver_name, verbose, model, warm_start,
+        epsilon):
+    if solver_name in NATIVE_SOLVERS:
+        kwargs = {'epsilon': epsilon} if solver_name == 'fptas' else {}
+        with tu.stats.phase('native'):
+            return NATIVE_SOLVERS[solver_name](n_seats=n_seats, alpha=alpha, costs=costs,
+                    weights=weights, mode=mode, verbose=verbose, **kwargs)
+
+    if model is not None:
+        return model.update(costs=costs, weights=weights, alpha=alpha).solve(verbose=verbose,
+                warm_start=warm_start)
+
+    if n_seats >= LARGE_MODEL_SEATS:
+        with tu.stats.phase('build'):
+            model = get_model_large(n_seats=n_seats, alpha=alpha, costs=costs, weights=weights,
+                    mode=mode)
+        return solve_large(model=model, solver_name=solver_name, verbose=verbose,
+                warm_start=warm_start)
+
+    with tu.stats.phase('build'):
+        model = get_model(n_seats=n_seats, alpha=alpha, costs=costs, weights=weights, mode=mode)
+
+    return solve(model=model, solver_name=solver_name, verbose=verbose, warm_start=warm_start)
+
+
+def optimize(n_seats, alpha, costs, weights, mode, solver_name, verbose, model=None, cache=None,
+        warm_start=None, epsilon=0.01):
+    '''
+    Solves the minimization knapsack problem with either a native solver (see NATIVE_SOLVERS) or
+    with Pyomo and the given solver
+    Parameters:
+        - n_seats: int, number of seats in the committee
+        - alpha: float, fraction of the total voting power
+        - costs: array of floats, costs of seats
+        - weights: array of integers, voting power of seats
+        - mode: str, either stop or overtake
+        - solver_name: str, solver name
+        - verbose: bool, verbose outputs
+        - model: PersistentModel to update and reuse instead of building a new Pyomo model,
+          ignored by native solvers
+        - cache: cache_utils.SolveCache to look the solution up in before solving, if given
+        - warm_start: list of seats selected in a previous solution (e.g. the previous point of
+          a sweep). It is returned without solving if is_certified proves it optimal, otherwise
+          it is passed to Pyomo solvers as a MIP start.
+        - epsilon: float, maximum relative error of the fptas solver, ignored by other solvers
+    Returns:
+        - the same tuple as solve; on a cache hit or a certified warm start, with a Solution
+          instead of the Pyomo instance
+    '''
+    with tu.stats.solve():
+        return _optimize_cached(n_seats=n_seats, alpha=alpha, costs=costs, weights=weights,
+                mode=mode, solver_name=solver_name, verbose=verbose, model=model, cache=cache,
+                warm_start=warm_start, epsilon=epsilon)
+
+
+def _optimize_cached(n_seats, alpha, costs, weights, mode, solver_name, verbose, model, cache,
+        warm_start, epsilon):
+    costs = np.asarray(costs, dtype=float)[:n_seats]
+    weights = np.asarray(weights)[:n_seats]
+
+    if cache is not None:
+        # approximate solutions are cached per accuracy
+        name = solver_name if solver_name != 'fptas' else '{}({!r})'.format(solver_name, epsilon)
+        with tu.stats.phase('cache'):
+            key = cache.key(costs=costs, weights=weights, alpha=alpha, mode=mode,
+                    solver_name=name)
+            entry = cache.get(key)
+        if entry is not None:
+            if verbose:
+                print('Solution found in cache')
+            x = np.zeros(n_seats, dtype=bool)
+            x[np.asarray(entry[1], dtype=int) - 1] = True
+            return _unpack(alpha, costs, weights, x)
+
+    if warm_start is not None:
+        x = np.zeros(n_seats, dtype=bool)
+        x[np.asarray(warm_start, dtype=int) - 1] = True
+        with tu.stats.phase('certificate'):
+            certified = is_certified(alpha=alpha, costs=costs, weights=weights, mode=mode, x=x)
+        if certified:
+            if verbose:
+                print('Warm start is optimal: it attains the LP relaxation bound')
+            return _unpack(alpha, costs, weights, x)
+
+    result = _optimize(n_seats=n_seats, alpha=alpha, costs=costs, weights=weights, mode=mode,
+            solver_name=solver_name, verbose=verbose, model=model, warm_start=warm_start,
+            epsilon=epsilon)
+
+    if cache is not None:
+        with tu.stats.phase('cache'):
+            cache.put(key, attacker_cost=result[3], selected_seats=result[4])
+
+    return result
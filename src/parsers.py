@@ -1,5 +1,7 @@
 import argparse
 
+from src.io_utils import IF_EXISTS, FORMATS
+
 
 class NumSeatsAction(argparse.Action):
     ''' Class of a new action for arguments that must be initialized with integers > 3
@@ -101,9 +103,10 @@ def main_parser():
             type=str,
             required=False,
             default='zipf',
-            choices=['zipf', 'random'],
+            choices=['zipf', 'random', 'stake'],
             help='if zipf, generate costs and weights according to Zipf law; ' +
-                'if random, generate random data for costs and weights, defaults to zipf',
+                'if random, generate random data for costs and weights; if stake, generate\n' +
+                'random costs and heavy-tailed fractional weights, defaults to zipf',
             )
     optional_args.add_argument(
             '--zipfc',
@@ -114,6 +117,15 @@ def main_parser():
             default=1,
             help='zipf coefficient (if data needs to be generated using Zipf law), defaults to 1',
             )
+    optional_args.add_argument(
+            '--k',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='> 0',
+            default=1,
+            help='k in k-scheme (if data needs to be generated using Zipf law), defaults to 1',
+            )
     optional_args.add_argument(
             '--max_weight',
             type=int,
@@ -128,7 +140,65 @@ def main_parser():
             type=str,
             required=False,
             default='glpk',
-            help='solver name, defaults to glpk',
+            help='solver name: dp for the built-in dynamic programming solver (integer voting\n' +
+                'power only), kscheme for the built-in solver exploiting few distinct values of\n' +
+                'voting power, fptas for the built-in approximation scheme (any voting power),\n' +
+                'lp_glpk or lp_cbc to run glpsol or cbc on an LP file written without Pyomo,\n' +
+                'or any solver supported by Pyomo, defaults to glpk',
+            )
+    optional_args.add_argument(
+            '--epsilon',
+            action=PositiveNumberAction,
+            type=float,
+            required=False,
+            metavar='> 0',
+            default=0.01,
+            help='maximum relative error of the attacker cost found by fptas, defaults to 0.01',
+            )
+    optional_args.add_argument(
+            '--save_fig',
+            type=str,
+            required=False,
+            default=None,
+            metavar='FILE',
+            help='save the solved committee to an image file, e.g. committee.png or\n' +
+                'committee.svg, without opening a window, defaults to None',
+            )
+    optional_args.add_argument(
+            '--label_limit',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='> 0',
+            default=100,
+            help='largest committee whose seats are labelled in plots, defaults to 100',
+            )
+    optional_args.add_argument(
+            '--top_k',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='K',
+            default=None,
+            help='also list the K cheapest distinct sets of seats the attacker can select\n' +
+                '(integer voting power only), defaults to None',
+            )
+    optional_args.add_argument(
+            '--cache_dir',
+            type=str,
+            required=False,
+            default=None,
+            help='directory of the on-disk cache of solved problems, defaults to None (no cache)',
+            )
+    optional_args.add_argument(
+            '--cache_size',
+            action=PositiveNumberAction,
+            type=float,
+            required=False,
+            metavar='> 0',
+            default=100,
+            help='maximum size of the cache in MB, least recently used entries are evicted\n' +
+                'beyond it, defaults to 100',
             )
     optional_args.add_argument(
             '--latex',
@@ -154,6 +224,18 @@ def main_parser():
             default=False,
             help='verbose outputs, defaults to False'
             )
+    optional_args.add_argument(
+            '--timing',
+            type=str,
+            nargs='?',
+            required=False,
+            default=None,
+            const='timing.json',
+            metavar='FILE',
+            help='time the phases of every solve, print a summary and save it to FILE,\n' +
+                'defaults to timing.json if FILE is omitted; setting the environment variable\n' +
+                'KP_TIMING also enables the summary',
+            )
 
     return parser
 
@@ -235,12 +317,63 @@ def attacker_cost_parser():
             default=0.01,
             help='step to generate range of zipf coefficients, default to 0.01',
             )
+    # approximate solves and the parametric sweep are two ways of covering the range
+    sweep_args = optional_args.add_mutually_exclusive_group()
+    sweep_args.add_argument(
+            '--approx',
+            action=PositiveNumberAction,
+            type=float,
+            required=False,
+            metavar='TOL',
+            default=None,
+            help='solve every point approximately by rounding the LP relaxation and solve it\n' +
+                'exactly only if the relative gap to the LP bound exceeds TOL; the gaps are\n' +
+                'saved with the costs, defaults to None (exact solves)',
+            )
+    sweep_args.add_argument(
+            '--parametric',
+            action='store_true',
+            default=False,
+            help='find the exact values of zipf coefficient where the optimal selection changes\n' +
+                'and evaluate the cost of every selection in closed form instead of solving\n' +
+                'every point of the range, defaults to False',
+            )
     optional_args.add_argument(
             '--solver',
             type=str,
             required=False,
             default='glpk',
-            help='solver name, defaults to glpk',
+            help='solver name: dp for the built-in dynamic programming solver (integer voting\n' +
+                'power only), kscheme for the built-in solver exploiting few distinct values of\n' +
+                'voting power, fptas for the built-in approximation scheme (any voting power),\n' +
+                'lp_glpk or lp_cbc to run glpsol or cbc on an LP file written without Pyomo,\n' +
+                'or any solver supported by Pyomo, defaults to glpk',
+            )
+    optional_args.add_argument(
+            '--epsilon',
+            action=PositiveNumberAction,
+            type=float,
+            required=False,
+            metavar='> 0',
+            default=0.01,
+            help='maximum relative error of the attacker cost found by fptas, defaults to 0.01',
+            )
+    optional_args.add_argument(
+            '--cache_dir',
+            type=str,
+            required=False,
+            default=None,
+            help='directory of the on-disk cache of solved problems, defaults to None (no cache)',
+            )
+    optional_args.add_argument(
+            '--cache_size',
+            action=PositiveNumberAction,
+            type=float,
+            required=False,
+            metavar='> 0',
+            default=100,
+            help='maximum size of the cache in MB, least recently used entries are evicted\n' +
+                'beyond it, defaults to 100',
             )
     optional_args.add_argument(
             '--latex',
@@ -266,12 +399,49 @@ def attacker_cost_parser():
             default=False,
             help='verbose outputs, defaults to False'
             )
+    optional_args.add_argument(
+            '--timing',
+            type=str,
+            nargs='?',
+            required=False,
+            default=None,
+            const='timing.json',
+            metavar='FILE',
+            help='time the phases of every solve, print a summary and save it to FILE,\n' +
+                'defaults to timing.json if FILE is omitted; setting the environment variable\n' +
+                'KP_TIMING also enables the summary',
+            )
     optional_args.add_argument(
             '--csv',
             action='store_true',
             default=False,
             help='save data to CSV file, defaults to False'
             )
+    optional_args.add_argument(
+            '--if_exists',
+            type=str,
+            required=False,
+            default='fail',
+            choices=IF_EXISTS,
+            help='what to do if the CSV file exists: fail before computing anything,\n' +
+                'overwrite it, rename the new file or skip saving data, defaults to fail',
+            )
+    optional_args.add_argument(
+            '--format',
+            type=str,
+            required=False,
+            default='csv',
+            choices=FORMATS,
+            help='format of the file saved with --csv: csv, npy (memory-mapped when read back),\n' +
+                'npz or parquet (needs pyarrow or fastparquet), defaults to csv',
+            )
+    optional_args.add_argument(
+            '--resume',
+            action='store_true',
+            default=False,
+            help='continue the CSV file of an interrupted run, solving only the values of the\n' +
+                'grid it does not hold yet, defaults to False'
+            )
 
     return parser
 
@@ -354,6 +524,27 @@ def attacker_cost_k_parser():
             default=0.01,
             help='step to generate range of zipf coefficients, default to 0.01',
             )
+    # approximate solves and the parametric sweep are two ways of covering the range
+    sweep_args = optional_args.add_mutually_exclusive_group()
+    sweep_args.add_argument(
+            '--approx',
+            action=PositiveNumberAction,
+            type=float,
+            required=False,
+            metavar='TOL',
+            default=None,
+            help='solve every point approximately by rounding the LP relaxation and solve it\n' +
+                'exactly only if the relative gap to the LP bound exceeds TOL; the gaps are\n' +
+                'saved with the costs, defaults to None (exact solves)',
+            )
+    sweep_args.add_argument(
+            '--parametric',
+            action='store_true',
+            default=False,
+            help='find the exact values of zipf coefficient where the optimal selection changes\n' +
+                'and evaluate the cost of every selection in closed form instead of solving\n' +
+                'every point of the range, defaults to False',
+            )
     optional_args.add_argument(
             '--k_max',
             action=NatNumbAction,
@@ -363,12 +554,52 @@ def attacker_cost_k_parser():
             default=5,
             help='maximum value of k, default to 5',
             )
+    optional_args.add_argument(
+            '--workers',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='> 0',
+            default=1,
+            help='number of worker processes to solve the grid of k and zipf coefficients,\n' +
+                'default to 1',
+            )
     optional_args.add_argument(
             '--solver',
             type=str,
             required=False,
             default='glpk',
-            help='solver name, defaults to glpk',
+            help='solver name: dp for the built-in dynamic programming solver (integer voting\n' +
+                'power only), kscheme for the built-in solver exploiting few distinct values of\n' +
+                'voting power, fptas for the built-in approximation scheme (any voting power),\n' +
+                'lp_glpk or lp_cbc to run glpsol or cbc on an LP file written without Pyomo,\n' +
+                'or any solver supported by Pyomo, defaults to glpk',
+            )
+    optional_args.add_argument(
+            '--epsilon',
+            action=PositiveNumberAction,
+            type=float,
+            required=False,
+            metavar='> 0',
+            default=0.01,
+            help='maximum relative error of the attacker cost found by fptas, defaults to 0.01',
+            )
+    optional_args.add_argument(
+            '--cache_dir',
+            type=str,
+            required=False,
+            default=None,
+            help='directory of the on-disk cache of solved problems, defaults to None (no cache)',
+            )
+    optional_args.add_argument(
+            '--cache_size',
+            action=PositiveNumberAction,
+            type=float,
+            required=False,
+            metavar='> 0',
+            default=100,
+            help='maximum size of the cache in MB, least recently used entries are evicted\n' +
+                'beyond it, defaults to 100',
             )
     optional_args.add_argument(
             '--latex',
@@ -394,12 +625,49 @@ def attacker_cost_k_parser():
             default=False,
             help='verbose outputs, defaults to False'
             )
+    optional_args.add_argument(
+            '--timing',
+            type=str,
+            nargs='?',
+            required=False,
+            default=None,
+            const='timing.json',
+            metavar='FILE',
+            help='time the phases of every solve, print a summary and save it to FILE,\n' +
+                'defaults to timing.json if FILE is omitted; setting the environment variable\n' +
+                'KP_TIMING also enables the summary',
+            )
     optional_args.add_argument(
             '--csv',
             action='store_true',
             default=False,
             help='save data to CSV file, defaults to False'
             )
+    optional_args.add_argument(
+            '--if_exists',
+            type=str,
+            required=False,
+            default='fail',
+            choices=IF_EXISTS,
+            help='what to do if the CSV file exists: fail before computing anything,\n' +
+                'overwrite it, rename the new file or skip saving data, defaults to fail',
+            )
+    optional_args.add_argument(
+            '--format',
+            type=str,
+            required=False,
+            default='csv',
+            choices=FORMATS,
+            help='format of the file saved with --csv: csv, npy (memory-mapped when read back),\n' +
+                'npz or parquet (needs pyarrow or fastparquet), defaults to csv',
+            )
+    optional_args.add_argument(
+            '--resume',
+            action='store_true',
+            default=False,
+            help='continue the CSV file of an interrupted run, solving only the values of the\n' +
+                'grid it does not hold yet, defaults to False'
+            )
 
     return parser
 def costs_parser():
@@ -504,5 +772,478 @@ def costs_parser():
             default=False,
             help='save data to CSV file, defaults to False'
             )
+    optional_args.add_argument(
+            '--if_exists',
+            type=str,
+            required=False,
+            default='fail',
+            choices=IF_EXISTS,
+            help='what to do if the CSV file exists: fail before computing anything,\n' +
+                'overwrite it, rename the new file or skip saving data, defaults to fail',
+            )
+    optional_args.add_argument(
+            '--format',
+            type=str,
+            required=False,
+            default='csv',
+            choices=FORMATS,
+            help='format of the file saved with --csv: csv, npy (memory-mapped when read back),\n' +
+                'npz or parquet (needs pyarrow or fastparquet), defaults to csv',
+            )
+    optional_args.add_argument(
+            '--float32',
+            action='store_true',
+            default=False,
+            help='compute costs in single precision to save memory, defaults to False'
+            )
+
+    return parser
+
+
+def benchmark_parser():
+    '''
+    Creates help file and parses command line arguments for the benchmark script, i.e.
+    benchmark.py
+    Parameters:
+        - no input parameters
+    Returns:
+        - args, class 'argparse.Namespace'
+    '''
+
+    formatter = lambda prog: argparse.RawTextHelpFormatter(prog, max_help_position=50)
+    parser = argparse.ArgumentParser(
+            description='Times data generation, model building, solving and sweeps',
+            add_help=False,
+            formatter_class=formatter,
+            )
+
+    optional_args = parser.add_argument_group('optional arguments')
+    optional_args.add_argument(
+            '-h',
+            '--help',
+            action='help',
+            help='show this help message and exit',
+            )
+    optional_args.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            required=False,
+            metavar='{4,5,...}',
+            default=[10, 100, 1000, 10000, 100000],
+            help='numbers of seats in the committee, defaults to 10 100 1000 10000 100000',
+            )
+    optional_args.add_argument(
+            '--solvers',
+            type=str,
+            nargs='+',
+            required=False,
+            default=['dp', 'kscheme', 'fptas', 'glpk', 'cbc', 'lp_glpk', 'lp_cbc'],
+            help='solver names, unavailable ones are skipped, defaults to dp kscheme fptas glpk\n' +
+                'cbc lp_glpk lp_cbc',
+            )
+    optional_args.add_argument(
+            '--mode',
+            type=str,
+            choices=['stop', 'overtake'],
+            required=False,
+            default='stop',
+            help='mode to simulate: either stop or overtake the committee, defaults to stop',
+            )
+    optional_args.add_argument(
+            '--k',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='> 0',
+            default=3,
+            help='k of the k-scheme to generate voting power, defaults to 3',
+            )
+    optional_args.add_argument(
+            '--repeats',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='> 0',
+            default=3,
+            help='number of repetitions of every measurement, the fastest is kept, defaults to 3',
+            )
+    optional_args.add_argument(
+            '--budget',
+            action=PositiveNumberAction,
+            type=float,
+            required=False,
+            metavar='> 0',
+            default=60,
+            help='larger sizes are skipped for a benchmark once a run exceeds this number of\n' +
+                'seconds, defaults to 60',
+            )
+    optional_args.add_argument(
+            '--sweep_max_seats',
+            action=NumSeatsAction,
+            type=int,
+            required=False,
+            metavar='{4,5,...}',
+            default=1000,
+            help='maximum number of seats for the sweep scripts, defaults to 1000',
+            )
+    optional_args.add_argument(
+            '--output',
+            type=str,
+            required=False,
+            default='benchmark.json',
+            help='JSON file to save results to, defaults to benchmark.json',
+            )
+    optional_args.add_argument(
+            '--baseline',
+            type=str,
+            required=False,
+            default=None,
+            help='JSON file of a previous run to compare results with, defaults to None',
+            )
+    optional_args.add_argument(
+            '--tolerance',
+            action=PositiveNumberAction,
+            type=float,
+            required=False,
+            metavar='> 0',
+            default=1.25,
+            help='slowdown ratio over the baseline reported as a regression, defaults to 1.25',
+            )
+
+    return parser
+
+
+def threshold_curve_parser():
+    '''
+    Creates help file and parses command line arguments for the threshold curve script, i.e.
+    threshold_curve.py
+    Parameters:
+        - no input parameters
+    Returns:
+        - args, class 'argparse.Namespace'
+    '''
+
+    formatter = lambda prog: argparse.RawTextHelpFormatter(prog, max_help_position=50)
+    parser = argparse.ArgumentParser(
+            description='Computes attacker cost for every threshold of voting power',
+            add_help=False,
+            formatter_class=formatter,
+            )
+
+    # required arguments
+    required_args = parser.add_argument_group('required arguments')
+    required_args.add_argument(
+            '--n_nodes',
+            action=NumSeatsAction,
+            type=int,
+            required=True,
+            metavar='{4,5,...}',
+            help='number of nodes in the network',
+            )
+    required_args.add_argument(
+            '--n_seats',
+            action=NumSeatsAction,
+            type=int,
+            required=True,
+            metavar='{4,5,...}',
+            help='number of seats in the committee',
+            )
+
+    # optimal arguments
+    optional_args = parser.add_argument_group('optional arguments')
+    optional_args.add_argument(
+            '-h',
+            '--help',
+            action='help',
+            help='show this help message and exit',
+            )
+    optional_args.add_argument(
+            '--zipfc',
+            action=PositiveNumberAction,
+            type=float,
+            required=False,
+            metavar='> 0',
+            default=1,
+            help='zipf coefficient, defaults to 1',
+            )
+    optional_args.add_argument(
+            '--k',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='> 0',
+            default=1,
+            help='k in k-scheme, defaults to 1',
+            )
+    optional_args.add_argument(
+            '--quorum',
+            type=float,
+            nargs='+',
+            required=False,
+            metavar='FRACTION',
+            default=[],
+            help='fractions of the total voting power of further quorum rules to report the\n' +
+                'attacker cost for, besides stop and overtake, defaults to none',
+            )
+    optional_args.add_argument(
+            '--latex',
+            action='store_true',
+            default=False,
+            help='use LaTeX in plots, defaults to False'
+            )
+    optional_args.add_argument(
+            '--hide_plots',
+            action='store_true',
+            default=False,
+            help='do not show plots, defaults to False'
+            )
+    optional_args.add_argument(
+            '--csv',
+            action='store_true',
+            default=False,
+            help='save data to CSV file, defaults to False'
+            )
+    optional_args.add_argument(
+            '--if_exists',
+            type=str,
+            required=False,
+            default='fail',
+            choices=IF_EXISTS,
+            help='what to do if the CSV file exists: fail before computing anything,\n' +
+                'overwrite it, rename the new file or skip saving data, defaults to fail',
+            )
+    optional_args.add_argument(
+            '--format',
+            type=str,
+            required=False,
+            default='csv',
+            choices=FORMATS,
+            help='format of the file saved with --csv: csv, npy (memory-mapped when read back),\n' +
+                'npz or parquet (needs pyarrow or fastparquet), defaults to csv',
+            )
+
+    return parser
+
+
+def monte_carlo_parser():
+    '''
+    Creates help file and parses command line arguments for the Monte Carlo script, i.e.
+    monte_carlo.py
+    Parameters:
+        - no input parameters
+    Returns:
+        - args, class 'argparse.Namespace'
+    '''
+
+    formatter = lambda prog: argparse.RawTextHelpFormatter(prog, max_help_position=50)
+    parser = argparse.ArgumentParser(
+            description='Computes the distribution of attacker cost over random committees',
+            add_help=False,
+            formatter_class=formatter,
+            )
+
+    # required arguments
+    required_args = parser.add_argument_group('required arguments')
+    required_args.add_argument(
+            '--n_seats',
+            action=NumSeatsAction,
+            type=int,
+            required=True,
+            metavar='{4,5,...}',
+            help='number of seats in the committee',
+            )
+    required_args.add_argument(
+            '--mode',
+            type=str,
+            choices=['stop', 'overtake'],
+            required=True,
+            help='mode to simulate: either stop or overtake the committee',
+            )
+
+    # optimal arguments
+    optional_args = parser.add_argument_group('optional arguments')
+    optional_args.add_argument(
+            '-h',
+            '--help',
+            action='help',
+            help='show this help message and exit',
+            )
+    optional_args.add_argument(
+            '--samples',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='> 0',
+            default=10000,
+            help='number of random committees, defaults to 10000',
+            )
+    optional_args.add_argument(
+            '--seed',
+            type=int,
+            action=NatNumbAction,
+            required=False,
+            default=2021,
+            metavar='{1,2,...}',
+            help='seed for random generator, defaults to 2021',
+            )
+    optional_args.add_argument(
+            '--max_weight',
+            type=int,
+            action=MaxWeightAction,
+            required=False,
+            default=20,
+            metavar='{1,2,...,20}',
+            help='maximum value of voting power, defaults to 20',
+            )
+    optional_args.add_argument(
+            '--batch_size',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='> 0',
+            default=1000,
+            help='number of committees drawn and solved together, each batch has its own\n' +
+                'random stream, defaults to 1000',
+            )
+    optional_args.add_argument(
+            '--workers',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='> 0',
+            default=1,
+            help='number of worker processes to solve the batches, defaults to 1',
+            )
+    optional_args.add_argument(
+            '--bins',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='> 0',
+            default=50,
+            help='number of bins of the histogram, defaults to 50',
+            )
+    optional_args.add_argument(
+            '--latex',
+            action='store_true',
+            default=False,
+            help='use LaTeX in plots, defaults to False'
+            )
+    optional_args.add_argument(
+            '--hide_plots',
+            action='store_true',
+            default=False,
+            help='do not show plots, defaults to False'
+            )
+    optional_args.add_argument(
+            '--csv',
+            action='store_true',
+            default=False,
+            help='save data to CSV file, defaults to False'
+            )
+    optional_args.add_argument(
+            '--if_exists',
+            type=str,
+            required=False,
+            default='fail',
+            choices=IF_EXISTS,
+            help='what to do if the CSV file exists: fail before computing anything,\n' +
+                'overwrite it, rename the new file or skip saving data, defaults to fail',
+            )
+    optional_args.add_argument(
+            '--format',
+            type=str,
+            required=False,
+            default='csv',
+            choices=FORMATS,
+            help='format of the file saved with --csv: csv, npy (memory-mapped when read back),\n' +
+                'npz or parquet (needs pyarrow or fastparquet), defaults to csv',
+            )
+
+    return parser
+
+
+def batch_parser():
+    '''
+    Creates help file and parses command line arguments for the batch script, i.e. batch.py
+    Parameters:
+        - no input parameters
+    Returns:
+        - args, class 'argparse.Namespace'
+    '''
+
+    formatter = lambda prog: argparse.RawTextHelpFormatter(prog, max_help_position=50)
+    parser = argparse.ArgumentParser(
+            description='Solves many scenarios of the main script in one process',
+            add_help=False,
+            formatter_class=formatter,
+            )
+
+    # required arguments
+    required_args = parser.add_argument_group('required arguments')
+    required_args.add_argument(
+            '--jobs',
+            type=str,
+            required=True,
+            metavar='FILE',
+            help='JSONL or CSV file of scenarios, one per line or row, whose keys or columns\n' +
+                'are options of the main script, e.g. n_nodes, n_seats, mode, data, zipfc, k,\n' +
+                'seed and solver',
+            )
+
+    # optimal arguments
+    optional_args = parser.add_argument_group('optional arguments')
+    optional_args.add_argument(
+            '-h',
+            '--help',
+            action='help',
+            help='show this help message and exit',
+            )
+    optional_args.add_argument(
+            '--output',
+            type=str,
+            required=False,
+            default='batch_results.csv',
+            metavar='FILE',
+            help='CSV file the results are streamed to, one row per scenario, - for standard\n' +
+                'output, defaults to batch_results.csv',
+            )
+    optional_args.add_argument(
+            '--workers',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='> 0',
+            default=1,
+            help='number of worker processes to solve the scenarios, defaults to 1',
+            )
+    optional_args.add_argument(
+            '--chunksize',
+            action=NatNumbAction,
+            type=int,
+            required=False,
+            metavar='> 0',
+            default=16,
+            help='number of scenarios sent to a worker at once, defaults to 16',
+            )
+    optional_args.add_argument(
+            '--cache_dir',
+            type=str,
+            required=False,
+            default=None,
+            help='directory of the on-disk cache of solved problems, shared by the workers,\n' +
+                'defaults to None (no cache)',
+            )
+    optional_args.add_argument(
+            '--cache_size',
+            action=PositiveNumberAction,
+            type=float,
+            required=False,
+            metavar='> 0',
+            default=100,
+            help='maximum size of the cache in MB, least recently used entries are evicted\n' +
+                'beyond it, defaults to 100',
+            )
 
     return parser
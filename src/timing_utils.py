@@ -0,0 +1,141 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class SolveStats:
+    ''' Per-phase timers of solves. Every solve is recorded as a dict mapping phase names to
+    seconds. Phases are exclusive: the time of a nested phase is not counted in the enclosing one,
+    so the phases of a solve add up to its total time. Timers are no-ops unless enabled.
+    '''
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.records = []
+        self._record = None
+        self._stack = []
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    @contextmanager
+    def solve(self):
+        '''
+        Collects the phases timed inside the block as the record of one solve
+        '''
+        if not self.enabled or self._record is not None:
+            # nested solves (e.g. a fallback of a native solver) belong to the outer one
+            yield
+            return
+        self._record = {}
+        try:
+            with self.phase('other'):
+                yield
+        finally:
+            self.records += [self._record]
+            self._record = None
+
+    @contextmanager
+    def phase(self, name):
+        '''
+        Times the block as phase name of the current solve
+        '''
+        if not self.enabled or self._record is None:
+            yield
+            return
+        start = time.perf_counter()
+        self._stack += [0.0]
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()
+            self._record[name] = self._record.get(name, 0.0) + elapsed - nested
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def timed(self, name, f):
+        '''
+        Wraps function f so that its calls are timed as phase name
+        '''
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return f(*args, **kwargs)
+        return wrapper
+
+    def pop(self):
+        '''
+        Returns the records collected so far and clears them, e.g. to send them from a worker
+        '''
+        records, self.records = self.records, []
+        return records
+
+    def extend(self, records):
+        self.records += records
+
+    def summary(self):
+        '''
+        Summarizes the records per phase
+        Returns:
+            - dict mapping phase names to dicts of count, total, mean, p50, p90, p99 and max
+              seconds, plus the key 'solves' with the number of solves
+        '''
+        phases = sorted({p for r in self.records for p in r})
+        summary = {'solves': len(self.records)}
+        for p in phases:
+            t = np.array([r[p] for r in self.records if p in r])
+            summary[p] = {
+                    'count': len(t),
+                    'total': t.sum(),
+                    'mean': t.mean(),
+                    'p50': np.percentile(t, 50),
+                    'p90': np.percentile(t, 90),
+                    'p99': np.percentile(t, 99),
+                    'max': t.max(),
+                    }
+        return summary
+
+    def report(self):
+        '''
+        Prints the summary as a table
+        '''
+        summary = self.summary()
+        total = sum(v['total'] for k, v in summary.items() if k != 'solves')
+
+        print('Timing of {} solves:'.format(summary['solves']))
+        print('{:<16} {:>8} {:>10} {:>6} {:>10} {:>10} {:>10} {:>10}'.format('phase', 'count',
+            'total, s', '%', 'p50, s', 'p90, s', 'p99, s', 'max, s'))
+        for p, v in summary.items():
+            if p == 'solves':
+                continue
+            print('{:<16} {:>8} {:>10.4f} {:>6.1f} {:>10.6f} {:>10.6f} {:>10.6f} {:>10.6f}'.format(
+                p, v['count'], v['total'], 100 * v['total'] / total if total else 0, v['p50'],
+                v['p90'], v['p99'], v['max']))
+
+    def save(self, fname):
+        '''
+        Saves the summary and the records to a JSON file
+        '''
+        with open(fname, 'w') as f:
+            json.dump({'summary': self.summary(), 'records': self.records}, f, indent=2)
+        print('Timing saved in {}'.format(fname))
+
+
+# timers shared by the whole process, enabled by the KP_TIMING environment variable or --timing
+stats = SolveStats(enabled=bool(os.environ.get('KP_TIMING')))
+
+
+def instrument_solver(solver):
+    '''
+    Times the phases of a Pyomo shell solver: writing the input file, running the solver process
+    and reading its output. Solvers without these methods (e.g. persistent ones) are left as is.
+    '''
+    if not stats.enabled:
+        return solver
+    for attr, name in [('_presolve', 'write'), ('_apply_solver', 'solver'),
+            ('_postsolve', 'read')]:
+        if hasattr(solver, attr):
+            setattr(solver, attr, stats.timed(name, getattr(solver, attr)))
+    return solver
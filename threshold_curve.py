@@ -0,0 +1,71 @@
+# Calculates attacker cost as a function of the threshold of voting power the attacker has to
+# obtain, for a given Zipf coefficient and k in k-scheme
+
+import numpy as np
+
+from src.parsers import threshold_curve_parser
+import src.data_gen as dg
+import src.io_utils as io
+import src.opt_utils as opt
+
+
+def main():
+    args = threshold_curve_parser().parse_args()
+    fname = None
+    if args.csv:
+        io.check_format(args.format)
+        fname = io.get_fname('threshold_cost.{}'.format(args.format), if_exists=args.if_exists)
+
+    costs = dg.get_costs(n_nodes=args.n_nodes, zipf_coeffs=args.zipfc)[:args.n_seats]
+    weights = dg.get_voting_power(n_seats=args.n_seats, k=args.k)
+
+    # one DP pass gives the cost of every threshold, stop and overtake are read off it
+    curve = opt.get_threshold_curve(costs=costs, weights=weights)
+    power = np.arange(len(curve))
+    fraction = power / weights.sum()
+
+    # label, goal of the attacker, fraction of the total voting power and mode of every rule
+    rules = [('stop', 'stop the committee', 1.0 / 3, 'stop'),
+            ('overtake', 'overtake the committee', 2.0 / 3, 'overtake')] + \
+            [('quorum {:g}'.format(q), 'reach a quorum of {:g}'.format(q), q, 'stop')
+                    for q in args.quorum]
+    for _, goal, alpha, mode in rules:
+        threshold = opt.get_min_power(alpha=alpha, weights=weights, mode=mode)
+        if threshold < len(curve):
+            print('Minimum attacker cost to {} (voting power {}): {:.6f}'.format(goal, threshold,
+                curve[threshold]))
+        else:
+            print('The attacker cannot {}'.format(goal))
+
+    if fname is not None:
+        io.save_table(fname=fname, data={'power': power, 'fraction': fraction, 'cost': curve})
+        print('Data saved in {}'.format(fname))
+
+    if args.hide_plots:
+        return
+
+    import matplotlib.pyplot as plt
+
+    if args.latex:
+        plt.rcParams['font.size'] = 11
+        plt.rcParams['font.family'] = 'serif'
+        plt.rcParams['font.serif'] = ['Times New Roman'] + plt.rcParams['font.serif']
+        plt.rc('text', usetex=True)
+
+    title = 'Minimum attacker cost as a function of the threshold of voting power'
+    if args.latex:
+        title = r'{\bf %s}' % title
+    plt.title(label=title, fontweight='bold')
+
+    plt.step(fraction, curve, where='pre')
+    for label, _, alpha, _ in rules:
+        plt.axvline(x=alpha, linestyle='--', color='gray')
+        plt.text(alpha, 0, ' ' + label, rotation=90, va='bottom')
+    plt.xlabel('Fraction of the total voting power')
+    plt.ylabel('Attacker cost')
+
+    plt.show()
+
+
+if __name__ == '__main__':
+    main()